@@ -83,6 +83,33 @@ def _release_cached_obj(obj):
             pass
 
 
+def release_pinned_host_memory():
+    """Return cached pinned host blocks to the OS.
+
+    PyTorch's caching host allocator keeps pinned blocks after their tensors
+    are freed; an offloaded UNet/VAE would otherwise stay pinned (several GB)
+    after the modules move back to CUDA.
+    """
+    empty_cache = getattr(torch._C, "_host_emptyCache", None)
+    if empty_cache is not None and torch.cuda.is_available():
+        empty_cache()
+
+
+def offload_to_cpu(*modules):
+    """Move modules to CPU with overlapped device-to-host copies.
+
+    non_blocking copies land in pinned host memory, so the transfers queue
+    back to back and a single synchronize replaces a stall per tensor.
+    """
+    for module in modules:
+        module.to("cpu", non_blocking=True)
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+        # Drop blocks left over from earlier offloads; the new copies stay
+        # pinned until the modules go back to the GPU.
+        release_pinned_host_memory()
+
+
 def manage_cache(cache, key):
     """Enforce LRU-style cache limit."""
     if key in cache:
@@ -223,13 +250,8 @@ def build_second_pass_pipeline(model_path: Path, shared):
     
     return pipe
 
-def get_tokenizer(base_path: Path):
-    """Load and cache tokenizers only (lightweight)."""
-    key = str(base_path.resolve()) + "_tokenizers"
-    
-    if key in _TOKENIZER_CACHE:
-        return _TOKENIZER_CACHE[key]
-    
+def load_tokenizers(base_path: Path):
+    """Load both tokenizers for a model (uncached)."""
     tokenizer_path = base_path / "tokenizer"
     tokenizer_2_path = base_path / "tokenizer_2"
     
@@ -247,6 +269,18 @@ def get_tokenizer(base_path: Path):
             "laion/CLIP-ViT-bigG-14-laion2B-39B-b160k",
             pad_token="!", # SDXL uses '!' padding for openclip
         )
+
+    return tokenizer, tokenizer_2
+
+
+def get_tokenizer(base_path: Path):
+    """Load and cache tokenizers only (lightweight)."""
+    key = str(base_path.resolve()) + "_tokenizers"
+    
+    if key in _TOKENIZER_CACHE:
+        return _TOKENIZER_CACHE[key]
+    
+    tokenizer, tokenizer_2 = load_tokenizers(base_path)
     
     manage_cache(_TOKENIZER_CACHE, key)
     _TOKENIZER_CACHE[key] = (tokenizer, tokenizer_2)
@@ -432,6 +466,8 @@ class PipelineManager:
         self.base_scheduler_config = None
         self.last_used = 0
         self.lock = threading.Lock()
+        # Set by the GPU worker while a job is being processed.
+        self.is_busy = False
 
         self.current_second_pass_model = None
         self.current_loras = {}
@@ -626,6 +662,8 @@ class PipelineManager:
             self.set_active_unet("base")
 
             torch.cuda.synchronize()
+            # Modules back from a caption offload free their pinned copies
+            release_pinned_host_memory()
             self.last_used = time.time()
 
             return self.pipe, self.img2img, self.base_img2img, self.base_inpaint, self.trigger_phrase
@@ -9,6 +9,7 @@ from pathlib import Path
 from datetime import datetime
 
 from webbduck.core.generation import run_generation
+from webbduck.core.pipeline import pipeline_manager
 from webbduck.server.storage import save_images, append_session_entry
 from webbduck.server.events import broadcast_state
 from webbduck.server.state import update_stage, update_progress, snapshot
@@ -58,6 +59,12 @@ async def gpu_worker(queue):
 
     while True:
         job = await queue.get()
+        if job.get("cancelled"):
+            # Cancelled while queued; its future was already settled.
+            queue.task_done()
+            continue
+
+        pipeline_manager.is_busy = True
         on_start = job.get("on_start")
         on_finish = job.get("on_finish")
 
@@ -86,6 +93,7 @@ async def gpu_worker(queue):
                     except Exception:
                         pass
             finally:
+                pipeline_manager.is_busy = False
                 queue.task_done()
             continue
 
@@ -151,4 +159,5 @@ async def gpu_worker(queue):
                     pass
 
         finally:
+            pipeline_manager.is_busy = False
             queue.task_done()
@@ -24,6 +24,7 @@ KNOWN_DEFAULTS = {
 }
 
 _registry_lock = threading.Lock()
+_registry_version = 0
 
 
 def detect_arch(path: Path) -> str | None:
@@ -272,8 +273,14 @@ def merge_model_registry(disk_models: dict, hf_models: dict, persist: bool = Tru
     return final_registry
 
 
+def registry_version() -> int:
+    """Counter bumped whenever refresh_registries swaps in new entries."""
+    return _registry_version
+
+
 def refresh_registries() -> bool:
     """Refresh model/LoRA registries in place; returns True when changed."""
+    global _registry_version
     with _registry_lock:
         ensure_lora_registry()
         sync_lora_registry_file()
@@ -290,6 +297,7 @@ def refresh_registries() -> bool:
             MODEL_REGISTRY.update(new_models)
             LORA_REGISTRY.clear()
             LORA_REGISTRY.update(new_loras)
+            _registry_version += 1
 
         return changed
 
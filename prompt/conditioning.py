@@ -1,7 +1,7 @@
 """Standard SDXL prompt conditioning."""
 
 import torch
-from webbduck.prompt.management import chunk_prompt, truncate_to_tokens
+from webbduck.prompt.management import leading_chunk, truncate_to_tokens
 
 MAX_TOKENS = 77
 
@@ -85,8 +85,8 @@ def build_sdxl_conditioning(pipe, prompt, prompt_2, negative):
     device = pipe.device
 
     # Positive prompt
-    chunks = chunk_prompt(pipe.tokenizer, prompt)
-    chunks_2 = chunk_prompt(pipe.tokenizer, prompt_2 or prompt)
+    chunks = [leading_chunk(prompt)]
+    chunks_2 = [leading_chunk(prompt_2 or prompt)]
 
     token_embeds = encode_chunks_text_encoder(
         pipe.tokenizer,
@@ -126,7 +126,7 @@ def build_sdxl_conditioning(pipe, prompt, prompt_2, negative):
     )
 
     # Negative prompt
-    neg_chunks = chunk_prompt(pipe.tokenizer, negative)
+    neg_chunks = [leading_chunk(negative)]
 
     neg_token_embeds = encode_chunks_text_encoder(
         pipe.tokenizer,
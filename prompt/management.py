@@ -1,9 +1,20 @@
 """Prompt chunking, truncation, and compression."""
 
+from collections import OrderedDict
 from typing import List
 import re
+import weakref
 
 MAX_TOKENS = 77
+SEPARATOR = ", "
+
+# Fixed per-tokenizer token costs, dropped together with the tokenizer.
+_TOKENIZER_COSTS = weakref.WeakKeyDictionary()
+
+# Per-tokenizer LRU of prepared prompts; batches that only change the seed
+# or LoRAs re-run the same chunk/truncate work on identical text.
+PROMPT_CACHE_SIZE = 256
+_PROMPT_CACHE = weakref.WeakKeyDictionary()
 
 REPLACEMENTS = [
     (r"\b(extremely|very|ultra|highly)\s+(detailed|realistic)\b", r"\2"),
@@ -17,6 +28,8 @@ REPLACEMENTS = [
 def compress_prompt(text: str) -> str:
     """Apply compression rules to reduce token count."""
     assert isinstance(text, str), f"compress_prompt expected str, got {type(text)}"
+    if not text:
+        return text
     out = text.lower()
 
     for pattern, repl in REPLACEMENTS:
@@ -33,63 +46,155 @@ def compress_prompt(text: str) -> str:
     return ", ".join(parts)
 
 
-def chunk_prompt(tokenizer, text: str) -> List[str]:
-    """Split prompt into CLIP-sized chunks."""
-    parts = [p.strip() for p in text.split(",") if p.strip()]
+def _token_lengths(tokenizer, texts, add_special_tokens: bool = True):
+    """Token counts via return_length, skipping attention masks and type ids."""
+    return tokenizer(
+        texts,
+        truncation=False,
+        add_special_tokens=add_special_tokens,
+        return_length=True,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+    )["length"]
 
-    chunks = []
+
+def _token_length(tokenizer, text: str, add_special_tokens: bool = True) -> int:
+    """Token count for a single string."""
+    length = _token_lengths(tokenizer, text, add_special_tokens)
+    # Slow tokenizers unwrap single inputs to an int, fast ones keep a list.
+    return length[0] if isinstance(length, list) else length
+
+
+def _tokenizer_costs(tokenizer) -> dict:
+    """Measure (once) the token costs that do not depend on the text."""
+    costs = _TOKENIZER_COSTS.get(tokenizer)
+    if costs is None:
+        costs = {
+            "overhead": _token_length(tokenizer, ""),
+            "sep": _token_length(tokenizer, SEPARATOR, add_special_tokens=False),
+        }
+        _TOKENIZER_COSTS[tokenizer] = costs
+    return costs
+
+
+def _bos_eos_overhead(tokenizer) -> int:
+    """Number of special tokens added around every encoded text."""
+    return _tokenizer_costs(tokenizer)["overhead"]
+
+
+def _sep_tokens(tokenizer) -> int:
+    """Number of tokens the ", " separator contributes between parts."""
+    return _tokenizer_costs(tokenizer)["sep"]
+
+
+def _cached(tokenizer, key, compute):
+    """Return compute() memoized per tokenizer under key (bounded LRU)."""
+    cache = _PROMPT_CACHE.get(tokenizer)
+    if cache is None:
+        cache = OrderedDict()
+        _PROMPT_CACHE[tokenizer] = cache
+
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    value = compute()
+    cache[key] = value
+    if len(cache) > PROMPT_CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
+def _fits_by_length(tokenizer, text: str, max_tokens: int) -> bool:
+    """Cheap upper bound: each BPE token of ASCII text covers at least one character."""
+    return text.isascii() and len(text) + _bos_eos_overhead(tokenizer) <= max_tokens
+
+
+def _group_sequential(part_lens: List[int], sep_len: int, capacity: int) -> List[List[int]]:
+    """Greedy left-to-right grouping of part indices that keeps prompt order."""
+    groups = []
     current = []
+    used = 0
 
-    def token_len(txt):
-        return len(
-            tokenizer(
-                txt,
-                truncation=True,
-                max_length=MAX_TOKENS,
-                add_special_tokens=True,
-            )["input_ids"]
-        )
-
-    for part in parts:
-        trial = ", ".join(current + [part])
-        if token_len(trial) <= MAX_TOKENS:
-            current.append(part)
-        else:
-            if current:
-                chunks.append(", ".join(current))
-            current = []
+    for idx, part_len in enumerate(part_lens):
+        cost = part_len + (sep_len if current else 0)
+        if current and used + cost <= capacity:
+            current.append(idx)
+            used += cost
+            continue
+
+        if current:
+            groups.append(current)
+        current = [idx]
+        used = part_len
+
+    if current:
+        groups.append(current)
+
+    return groups
 
+
+def _prompt_parts(text: str) -> List[str]:
+    """Comma-separated prompt parts with surrounding whitespace stripped."""
+    return [p.strip() for p in text.split(",") if p.strip()]
+
+
+def leading_chunk(text: str) -> str:
+    """The prompt as the standard encoders see it.
+
+    Parts are re-joined in order and left for the encoder's own
+    truncation=True to cut at MAX_TOKENS, so the first ~75 content tokens
+    of the whole prompt are conditioned on, not only the parts that fit whole.
+    """
+    return SEPARATOR.join(_prompt_parts(text))
+
+
+def chunk_prompt(tokenizer, text: str) -> List[str]:
+    """Split prompt into CLIP-sized chunks, keeping prompt order."""
+    return list(_cached(
+        tokenizer,
+        ("chunk", text),
+        lambda: tuple(_chunk_prompt(tokenizer, text)),
+    ))
+
+
+def _chunk_prompt(tokenizer, text: str) -> List[str]:
+    """Uncached chunk_prompt implementation."""
+    parts = _prompt_parts(text)
+    if not parts:
+        return [""]
+
+    # CLIP pre-tokenizes on punctuation, so a joined chunk costs exactly
+    # sum(part_lens) + separators + special tokens; tokenize parts once.
+    overhead = _bos_eos_overhead(tokenizer)
+    sep_len = _sep_tokens(tokenizer)
+    part_lens = _token_lengths(tokenizer, parts, add_special_tokens=False)
+    capacity = MAX_TOKENS - overhead
+
+    chunks = []
+    for indices in _group_sequential(part_lens, sep_len, capacity):
+        if len(indices) == 1 and part_lens[indices[0]] > capacity:
             # Hard truncate the offending part
             tokens = tokenizer(
-                part,
+                parts[indices[0]],
                 truncation=True,
                 max_length=MAX_TOKENS,
                 add_special_tokens=True,
             )
-            truncated = tokenizer.decode(
+            chunks.append(tokenizer.decode(
                 tokens["input_ids"],
                 skip_special_tokens=True,
-            )
-            current.append(truncated)
-
-    if current:
-        chunks.append(", ".join(current))
+            ))
+            continue
 
-    if not chunks:
-        return [""]
+        chunks.append(SEPARATOR.join(parts[i] for i in indices))
 
     return chunks
 
 
 def tokenize_len(tokenizer, text: str) -> int:
     """Get token count for text."""
-    return len(
-        tokenizer(
-            text,
-            truncation=False,
-            add_special_tokens=True,
-        )["input_ids"]
-    )
+    return _token_length(tokenizer, text)
 
 
 def truncate_to_tokens(
@@ -98,6 +203,18 @@ def truncate_to_tokens(
     max_tokens: int = MAX_TOKENS,
 ) -> str:
     """Hard truncate text to fit CLIP token limit."""
+    if not text or _fits_by_length(tokenizer, text, max_tokens):
+        return text
+
+    return _cached(
+        tokenizer,
+        ("truncate", text, max_tokens),
+        lambda: _truncate_to_tokens(tokenizer, text, max_tokens),
+    )
+
+
+def _truncate_to_tokens(tokenizer, text: str, max_tokens: int) -> str:
+    """Uncached truncate_to_tokens implementation."""
     tokens = tokenizer(
         text,
         truncation=False,
@@ -126,6 +243,19 @@ def smart_truncate_prompt(
     debug = {}
 
     trigger = f"{trigger_phrase}, " if trigger_phrase else ""
+
+    # Short prompts cannot exceed the budget; skip compression entirely.
+    if _fits_by_length(tokenizer, f"{trigger}{user_prompt}", max_tokens):
+        final = f"{trigger}{user_prompt}".strip()
+        original_tokens = tokenize_len(tokenizer, user_prompt)
+        debug.update({
+            "original_tokens": original_tokens,
+            "compressed_tokens": original_tokens,
+            "final_tokens": tokenize_len(tokenizer, final),
+            "compressed": False,
+        })
+        return final, debug
+
     trigger_tokens = tokenize_len(tokenizer, trigger)
 
     compressed = compress_prompt(user_prompt)
@@ -146,4 +276,4 @@ def smart_truncate_prompt(
         "compressed": compressed != user_prompt,
     })
 
-    return final, debug
\ No newline at end of file
+    return final, debug
@@ -16,12 +16,17 @@ logging.basicConfig(
 )
 
 import argparse
+import importlib.util
 import os
 
 # Disable progress bars to prevent BrokenPipeError in background execution
 # os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "1"
 # os.environ["TQDM_DISABLE"] = "1"
 
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="WebbDuck SDXL Server")
     parser.add_argument("--output",type=str, help="Custom output directory for generated images")
@@ -37,4 +42,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=False,
+        # uvloop/httptools are in requirements.txt but have no Windows wheels.
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
     )
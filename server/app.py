@@ -1,21 +1,41 @@
 """FastAPI application and endpoints."""
 
 import asyncio
-import json
+import hashlib
 import uuid
 import time
 import os
+from collections import OrderedDict, deque
+from functools import lru_cache
 from pathlib import Path
 import shutil
-from fastapi import FastAPI, Form, WebSocket, UploadFile, File
-from fastapi.responses import HTMLResponse, JSONResponse
+import tempfile
+import threading
+import orjson
+from fastapi import Depends, FastAPI, Form, Request, WebSocket, UploadFile, File
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-
-from webbduck.server.state import snapshot, update_stage, update_progress
-from webbduck.server.events import broadcast, broadcast_state, active_sockets
-from webbduck.server.storage import save_images, BASE, to_web_path, resolve_web_path
-from webbduck.server.thumbnails import ensure_thumbnail
-from fastapi.responses import FileResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from webbduck.server.state import (
+    snapshot,
+    total_vram_gb,
+    update_stage,
+    update_progress,
+    update_vram,
+)
+from webbduck.server.events import (
+    broadcast,
+    broadcast_state,
+    broadcast_bytes,
+    serialize,
+    active_sockets,
+    register_socket,
+    unregister_socket,
+)
+from webbduck.server.storage import save_images, BASE, BASE_RESOLVED, to_web_path, resolve_web_path
+from webbduck.server.thumbnails import ensure_thumbnail, load_thumbnail
 from webbduck.core.worker import gpu_worker
 from webbduck.models.registry import (
     MODEL_REGISTRY,
@@ -25,6 +45,7 @@ from webbduck.models.registry import (
     LORA_FILE,
     MODELS_FILE,
     refresh_registries,
+    registry_version,
 )
 from webbduck.core.schedulers import SCHEDULERS
 from webbduck.core.captioner import (
@@ -37,17 +58,147 @@ from webbduck.core.captioner import (
 INPUTS_DIR = Path("inpaint_input")
 INPUTS_DIR.mkdir(exist_ok=True)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 THUMB_CONCURRENCY = max(1, int(os.getenv("WEBBDUCK_THUMB_CONCURRENCY", "2")))
 thumb_semaphore = asyncio.Semaphore(THUMB_CONCURRENCY)
 
-# Queue for GPU jobs
+# Queue for GPU jobs. A real bounded FIFO (not a single slot): clients may
+# stack up to 32 jobs, and queue positions/cancel tombstones rely on it.
+# Cancelled jobs stay in it as tombstones until the worker dequeues them, so
+# they keep holding a slot: cancelling does not free capacity while a long
+# job runs, and enqueue waits once 32 entries (live or cancelled) are queued.
 generation_queue = asyncio.Queue(maxsize=32)
-job_registry = {}
+# Insertion order == creation order, so no sorting is needed for payloads.
+job_registry: OrderedDict[str, dict] = OrderedDict()
+# Newest-first completed jobs.
+recent_completed: deque[dict] = deque(maxlen=50)
+# Jobs waiting in generation_queue, in FIFO order. Cancelling removes the
+# entry here and tombstones the job; the worker drops it on dequeue.
+queued_jobs: dict[str, dict] = {}
 active_job_id = None
+# Set whenever queue state changes; queue_broadcaster coalesces bursts.
+_queue_dirty: asyncio.Event | None = None
+QUEUE_BROADCAST_DELAY = 0.03
+# Set when new outputs land; gallery_indexer re-warms the gallery caches.
+_index_dirty: asyncio.Event | None = None
+# How many of the newest runs the background indexer keeps warm.
+GALLERY_INDEX_RUNS = 100
+# Set by vram_sampler when a state frame should ride on the pending queue frame.
+_state_pending = False
 CATALOG_POLL_SECONDS = max(1.0, float(os.getenv("WEBBDUCK_CATALOG_POLL_SECONDS", "3.0")))
 
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def _save_upload(upload: UploadFile, dest: Path):
+    """Stream an upload to disk in chunks, writing off the event loop."""
+    with open(dest, "wb") as buffer:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(buffer.write, chunk)
+
+
+def _store_input(data: bytes, suffix: str) -> Path:
+    """Write uploaded bytes under a content-hash name, reusing identical uploads."""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    file_path = INPUTS_DIR / f"{digest}{suffix}"
+    if not file_path.exists():
+        # Write aside and rename into place: the hash name only ever holds a
+        # complete file, and readers of an existing one keep their copy.
+        tmp = tempfile.NamedTemporaryFile(dir=INPUTS_DIR, suffix=".part", delete=False)
+        try:
+            with tmp:
+                tmp.write(data)
+            os.replace(tmp.name, file_path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+    return file_path
+
+
+@lru_cache(maxsize=256)
+def _parse_loras(raw: str) -> tuple:
+    """Decode the loras form field; repeats (mostly "[]") skip the parse.
+
+    Entries are shared between requests and are treated as read-only.
+    """
+    parsed = orjson.loads(raw)
+    return tuple(parsed) if isinstance(parsed, list) else ()
+
+
+class GenSettings(BaseModel):
+    """Form fields shared by /test and /generate."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    base_model: str
+    second_pass_model: str = "None"
+    second_pass_mode: str = "auto"
+    prompt: str = ""
+    prompt_2: str = ""
+    negative_prompt: str = ""
+    steps: int = 30
+    cfg: float = 7.5
+    width: int = 1024
+    height: int = 1024
+    loras: str = "[]"
+    experimental_compress: bool = False
+    wait_for_result: bool = True
+
+    def to_settings(self, **extra) -> dict:
+        """Build the job settings dict (loras decoded, transport flags dropped)."""
+        settings = self.model_dump(exclude={"loras", "wait_for_result"})
+        settings["loras"] = list(_parse_loras(self.loras))
+        settings.update(extra)
+        return settings
+
+
+class BatchSettings(GenSettings):
+    """/generate form fields."""
+
+    num_images: int = 4
+    seed: int | None = None
+    scheduler: str = "UniPC"
+    strength: float = 0.75
+    refinement_strength: float = 0.3
+    inpainting_fill: str = "replace"
+    mask_blur: int = 8
+
+
+def _form_model(model: type[BaseModel]):
+    """Dependency validating the whole request form against model in one call."""
+    fields = model.model_fields
+
+    async def parse(request: Request):
+        form = await request.form()
+        # Like Form() params, empty strings fall back to the field default;
+        # other form entries (uploads) never reach the model.
+        data = {k: v for k, v in form.items() if k in fields and v != ""}
+        try:
+            return model.model_validate(data)
+        except ValidationError as e:
+            # Report like Form() params: the field's own value, None if missing.
+            raise RequestValidationError([
+                {
+                    **err,
+                    "loc": ("body", *err["loc"]),
+                    "input": None if err["type"] == "missing" else err["input"],
+                }
+                for err in e.errors(include_url=False)
+            ])
+    return parse
+
+
+def _form_openapi(model: type[BaseModel], media_type: str) -> dict:
+    """openapi_extra documenting model's fields, which _form_model reads by hand."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {"schema": {"allOf": [model.model_json_schema()]}}},
+        },
+    }
+
+
 def summarize_loras(loras) -> list[str]:
     """Create compact LoRA labels for queue metadata."""
     if not isinstance(loras, list):
@@ -118,52 +269,91 @@ def summarize_settings(settings: dict) -> dict:
     }
 
 
+_FINISHED_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
 def build_queue_payload() -> dict:
-    """Build queue payload for API and WebSocket updates."""
+    """Build queue payload for API and WebSocket updates.
+
+    Job metadata is shared, not copied: queue_position is kept current on
+    each entry, and callers serialize the payload before yielding.
+    """
     jobs = []
-    recent_completed = []
-    queued_positions = {}
-    for idx, job in enumerate(list(generation_queue._queue), start=1):
-        jid = job.get("job_id")
-        if jid:
-            queued_positions[jid] = idx
-
-    for meta in sorted(job_registry.values(), key=lambda x: x.get("created_at", 0), reverse=True):
-        status = meta.get("status")
-        if status == "completed":
-            item = dict(meta)
-            item["queue_position"] = None
-            recent_completed.append(item)
+    for meta in reversed(job_registry.values()):
+        if meta.get("status") in _FINISHED_STATUSES:
             continue
-        if status in {"failed", "cancelled"}:
-            continue
-        item = dict(meta)
-        item["queue_position"] = queued_positions.get(item["job_id"])
-        jobs.append(item)
+        jobs.append(meta)
+        if len(jobs) >= 100:
+            break
 
     return {
         "active_job_id": active_job_id,
-        "queued_count": generation_queue.qsize(),
-        "jobs": jobs[:100],
-        "recent_completed": recent_completed[:50],
+        "queued_count": len(queued_jobs),
+        "jobs": jobs,
+        "recent_completed": list(recent_completed),
     }
 
 
 async def broadcast_queue_update():
     """Push queue update to connected WebSocket clients."""
-    await broadcast({
+    global _state_pending
+    if not active_sockets:
+        return
+    event = {
         "type": "queue",
         "payload": build_queue_payload(),
-    })
+    }
+    if _state_pending:
+        _state_pending = False
+        event["state"] = snapshot()
+    await broadcast_bytes("queue", serialize(event))
 
 
 def schedule_queue_update():
-    """Schedule queue update broadcast when in an async loop."""
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        return
-    loop.create_task(broadcast_queue_update())
+    """Mark queue state dirty so the next coalesced broadcast includes it.
+
+    With no clients connected nothing is scheduled; a client that connects
+    later receives a fresh snapshot from websocket_endpoint.
+    """
+    if _queue_dirty is not None and active_sockets:
+        _queue_dirty.set()
+
+
+async def queue_broadcaster():
+    """Push one queue snapshot per burst of queue changes."""
+    while True:
+        await _queue_dirty.wait()
+        # Let the burst settle; changes made meanwhile ride along.
+        await asyncio.sleep(QUEUE_BROADCAST_DELAY)
+        _queue_dirty.clear()
+        try:
+            await broadcast_queue_update()
+        except Exception as exc:
+            print(f"[Queue Broadcaster] broadcast failed: {exc}")
+
+
+def _renumber_queue():
+    """Refresh queue_position on every queued job's metadata."""
+    for idx, queued_id in enumerate(queued_jobs, start=1):
+        meta = job_registry.get(queued_id)
+        if meta is not None:
+            meta["queue_position"] = idx
+
+
+def _leave_queue(job_id: str) -> dict | None:
+    """Remove a job from the queued view; returns its queued job dict."""
+    queued_job = queued_jobs.pop(job_id, None)
+    if queued_job is not None:
+        meta = job_registry.get(job_id)
+        if meta is not None:
+            meta["queue_position"] = None
+        _renumber_queue()
+    return queued_job
+
+
+def _on_dequeue(job_id: str):
+    """Drop a job from the queued view once the worker has taken it."""
+    _leave_queue(job_id)
 
 
 def _mark_job_start(job):
@@ -171,6 +361,7 @@ def _mark_job_start(job):
     job_id = job.get("job_id")
     if not job_id:
         return
+    _on_dequeue(job_id)
     active_job_id = job_id
     meta = job_registry.get(job_id)
     if meta:
@@ -207,35 +398,46 @@ def _mark_job_finish(job, success: bool, error: str | None):
                             meta["result"] = compact
                 except Exception:
                     pass
+            recent_completed.appendleft(meta)
+            if _index_dirty is not None:
+                _index_dirty.set()
     if active_job_id == job_id:
         active_job_id = None
 
-    # Prevent unbounded growth.
+    # Prevent unbounded growth; insertion order is creation order, so the
+    # oldest jobs are at the front.
     if len(job_registry) > 300:
-        old_keys = sorted(
-            job_registry.keys(),
-            key=lambda k: job_registry[k].get("created_at", 0)
-        )[:100]
-        for key in old_keys:
-            job_registry.pop(key, None)
+        while len(job_registry) > 200:
+            job_registry.popitem(last=False)
     schedule_queue_update()
 
 
 def queue_position_for(job_id: str) -> int | None:
-    for idx, queued in enumerate(list(generation_queue._queue), start=1):
-        if queued.get("job_id") == job_id:
-            return idx
-    return None
+    meta = job_registry.get(job_id)
+    return meta.get("queue_position") if meta else None
+
+
+def _discard_result(fut: asyncio.Future):
+    if not fut.cancelled():
+        fut.exception()
 
 
 async def enqueue(job, wait_for_result: bool = True):
     """Enqueue job. Optionally wait for result."""
+    # Created here so requests rejected before enqueueing never allocate one.
+    job["future"] = future = asyncio.get_running_loop().create_future()
+    if not wait_for_result:
+        # Nobody awaits it; mark failures retrieved so they are not logged
+        # again as "exception was never retrieved" when collected.
+        future.add_done_callback(_discard_result)
     await generation_queue.put(job)
     job_id = job["job_id"]
+    queued_jobs[job_id] = job
     meta = job_registry[job_id]
     meta["status"] = "queued"
+    meta["queue_position"] = len(queued_jobs)
     meta["queued_at"] = time.time()
-    await broadcast_queue_update()
+    schedule_queue_update()
 
     if not wait_for_result:
         return {
@@ -244,14 +446,48 @@ async def enqueue(job, wait_for_result: bool = True):
             "queue_position": queue_position_for(job_id),
         }
 
-    return await job["future"]
+    return await future
 
 
 async def vram_sampler():
-    """Periodically broadcast VRAM stats."""
+    """Periodically broadcast VRAM stats.
+
+    Nothing is sampled while no client is connected. The cadence is 0.5s
+    while the GPU worker is busy, 1.5s for other work (e.g. captioning) and
+    2s when fully idle. Unchanged snapshots are skipped, and a snapshot taken
+    while a queue frame is pending rides along with it as its "state" field.
+    """
+    global _state_pending
+    from webbduck.core.pipeline import pipeline_manager
+
+    last_sig = None
     while True:
-        await asyncio.sleep(0.5)
-        await broadcast_state(snapshot())
+        if not active_sockets:
+            # Cheap check (no CUDA query), so new clients are picked up quickly
+            last_sig = None
+            await asyncio.sleep(0.5)
+            continue
+
+        update_vram()
+        snap = snapshot()
+        sig = (
+            round(snap["vram"]["used"], 2),
+            snap["stage"],
+            round(snap["progress"], 2),
+        )
+        if sig != last_sig:
+            last_sig = sig
+            if _queue_dirty is not None and _queue_dirty.is_set():
+                # A queue frame is about to go out; send one frame, not two.
+                _state_pending = True
+            else:
+                await broadcast_state(snap)
+        if pipeline_manager.is_busy:
+            await asyncio.sleep(0.5)
+        elif snap["stage"] == "Idle":
+            await asyncio.sleep(2.0)
+        else:
+            await asyncio.sleep(1.5)
 
 
 def _path_stamp(path: Path):
@@ -307,6 +543,33 @@ async def catalog_watcher():
             print(f"[Catalog Watcher] refresh failed: {exc}")
 
 
+# Derived catalog data (pre-serialized responses, lookup tables), rebuilt
+# when the registries change.
+_catalog_cache: dict = {"version": None}
+
+
+def _catalog_cached(key: str, build):
+    """Return build(), cached until the registry version moves.
+
+    Only called from async handlers, so it never races the catalog watcher.
+    """
+    version = registry_version()
+    if _catalog_cache["version"] != version:
+        _catalog_cache.clear()
+        _catalog_cache["version"] = version
+    if key not in _catalog_cache:
+        _catalog_cache[key] = build()
+    return _catalog_cache[key]
+
+
+def _second_pass_meta() -> dict[str, tuple[bool, bool]]:
+    """Per-model (is_sdxl, is_refiner) flags for second-pass validation."""
+    return {
+        name: (info.get("arch") == "sdxl", "refiner" in name.lower())
+        for name, info in MODEL_REGISTRY.items()
+    }
+
+
 def validate_second_pass(settings):
     """Validate second pass model configuration."""
     second_pass = settings.get("second_pass_model")
@@ -315,11 +578,12 @@ def validate_second_pass(settings):
     if not second_pass or second_pass == "None":
         return
 
-    entry = MODEL_REGISTRY.get(second_pass)
-    if not entry:
+    flags = _catalog_cached("second_pass_meta", _second_pass_meta).get(second_pass)
+    if flags is None:
         raise ValueError(f"Unknown second-pass model: {second_pass}")
 
-    if entry.get("arch") != "sdxl":
+    is_sdxl, is_refiner = flags
+    if not is_sdxl:
         raise ValueError(
             f"Second-pass model '{second_pass}' is not SDXL-compatible"
         )
@@ -327,7 +591,7 @@ def validate_second_pass(settings):
     if mode == "auto":
         return
 
-    if mode == "refiner" and "refiner" not in second_pass.lower():
+    if mode == "refiner" and not is_refiner:
         raise ValueError(
             "Second Pass Mode is set to 'Refiner', "
             "but the selected model does not appear to be a refiner.\n\n"
@@ -338,9 +602,15 @@ def validate_second_pass(settings):
 @app.on_event("startup")
 async def startup():
     """Start background tasks."""
+    global _queue_dirty, _index_dirty
+    _queue_dirty = asyncio.Event()
+    _index_dirty = asyncio.Event()
+    asyncio.create_task(queue_broadcaster())
     asyncio.create_task(gpu_worker(generation_queue))
     asyncio.create_task(vram_sampler())
     asyncio.create_task(catalog_watcher())
+    asyncio.create_task(gallery_indexer())
+    asyncio.create_task(asyncio.to_thread(_warm_tokenizers))
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -350,75 +620,80 @@ def ui():
     return ui_path.read_text()
 
 
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache write-once files outright.
+
+    Starlette already sends ETag/Last-Modified and answers 304s. Files that
+    write_once(path) accepts also get a long-lived immutable Cache-Control,
+    so browsers skip even the revalidation request; the rest get no-cache
+    and revalidate against the ETag.
+    """
+
+    immutable = "public, max-age=31536000, immutable"
+
+    def __init__(self, *args, write_once=lambda path: True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_once = write_once
+
+    def file_response(self, full_path, *args, **kwargs):
+        response = super().file_response(full_path, *args, **kwargs)
+        write_once = self.write_once(Path(full_path))
+        response.headers["Cache-Control"] = self.immutable if write_once else "no-cache"
+        return response
+
+
+def _output_is_write_once(path: Path) -> bool:
+    """Generated run images; upscales, meta, thumbnails and logs are rewritten."""
+    return (
+        path.suffix == ".png"
+        and not path.name.endswith("_upscaled.png")
+        and path.resolve().parent != BASE_RESOLVED
+    )
+
+
 app.mount("/ui", StaticFiles(directory=str(Path(__file__).parent.parent / "ui")), name="ui")
 
 # Mount dynamic output directory
-from webbduck.server.storage import BASE
-app.mount("/outputs", StaticFiles(directory=str(BASE)), name="outputs")
-app.mount("/inputs", StaticFiles(directory=str(INPUTS_DIR)), name="inputs")
+app.mount(
+    "/outputs",
+    CachedStaticFiles(directory=str(BASE), write_once=_output_is_write_once),
+    name="outputs",
+)
+# Uploads are stored under content-hash or uuid names and never rewritten.
+app.mount("/inputs", CachedStaticFiles(directory=str(INPUTS_DIR)), name="inputs")
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     """WebSocket connection for live updates."""
     await ws.accept()
-    await ws.send_text(json.dumps({
+    await ws.send_bytes(serialize({
         "type": "queue",
         "payload": build_queue_payload(),
     }))
-    active_sockets.add(ws)
+    sender = register_socket(ws)
     try:
+        # Push-only protocol: drain raw frames without decoding them.
         while True:
-            await ws.receive_text()
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     except Exception:
         pass
     finally:
-        active_sockets.discard(ws)
-
-
-@app.post("/test")
-async def test(
-    prompt: str = Form(""),
-    prompt_2: str = Form(""),
-    negative_prompt: str = Form(""),
-    steps: int = Form(30),
-    cfg: float = Form(7.5),
-    width: int = Form(1024),
-    height: int = Form(1024),
-    base_model: str = Form(...),
-    second_pass_model: str = Form("None"),
-    second_pass_mode: str = Form("auto"),
-    loras: str = Form("[]"),
-    experimental_compress: bool = Form(False),
-    wait_for_result: bool = Form(True),
-):
+        unregister_socket(ws, sender)
+
+
+@app.post("/test", openapi_extra=_form_openapi(GenSettings, "application/x-www-form-urlencoded"))
+async def test(form: GenSettings = Depends(_form_model(GenSettings))):
     """Generate single test image."""
-    lora_list = json.loads(loras)
-    loop = asyncio.get_event_loop()
-    future = loop.create_future()
-
-    settings = {
-        "base_model": base_model,
-        "second_pass_model": second_pass_model,
-        "second_pass_mode": second_pass_mode,
-        "prompt": prompt,
-        "prompt_2": prompt_2,
-        "negative_prompt": negative_prompt,
-        "steps": steps,
-        "cfg": cfg,
-        "width": width,
-        "height": height,
-        "num_images": 1,
-        "loras": lora_list,
-        "experimental_compress": experimental_compress,
-    }
+    settings = form.to_settings(num_images=1)
 
     job_id = str(uuid.uuid4())
     job = {
         "job_id": job_id,
         "type": "test",
         "settings": settings,
-        "future": future,
         "on_start": _mark_job_start,
         "on_finish": _mark_job_finish,
     }
@@ -426,6 +701,7 @@ async def test(
         "job_id": job_id,
         "type": "test",
         "status": "created",
+        "queue_position": None,
         "created_at": time.time(),
         "settings": summarize_settings(settings),
     }
@@ -438,79 +714,31 @@ async def test(
             "type": "validation_error"
         }
 
-    return await enqueue(job, wait_for_result=wait_for_result)
+    return await enqueue(job, wait_for_result=form.wait_for_result)
 
 
-@app.post("/generate")
+@app.post("/generate", openapi_extra=_form_openapi(BatchSettings, "multipart/form-data"))
 async def generate(
-    prompt: str = Form(""),
-    prompt_2: str = Form(""),
-    negative_prompt: str = Form(""),
-    steps: int = Form(30),
-    cfg: float = Form(7.5),
-    width: int = Form(1024),
-    height: int = Form(1024),
-    num_images: int = Form(4),
-    seed: int = Form(None),
-    base_model: str = Form(...),
-    second_pass_model: str = Form("None"),
-    second_pass_mode: str = Form("auto"),
-    loras: str = Form("[]"),
-
-    experimental_compress: bool = Form(False),
-    scheduler: str = Form("UniPC"),
-    strength: float = Form(0.75),
-    refinement_strength: float = Form(0.3),
+    form: BatchSettings = Depends(_form_model(BatchSettings)),
     image: UploadFile = File(None),
     mask: UploadFile = File(None),
-    inpainting_fill: str = Form("replace"),
-    mask_blur: int = Form(8),
-    wait_for_result: bool = Form(True),
 ):
     """Generate batch of images."""
-    lora_list = json.loads(loras)
-    loop = asyncio.get_event_loop()
-    future = loop.create_future()
-
-    settings = {
-        "base_model": base_model,
-        "second_pass_model": second_pass_model,
-        "second_pass_mode": second_pass_mode,
-        "prompt": prompt,
-        "prompt_2": prompt_2,
-        "negative_prompt": negative_prompt,
-        "steps": steps,
-        "cfg": cfg,
-        "width": width,
-        "height": height,
-        "num_images": num_images,
-        "seed": seed,
-        "loras": lora_list,
-        "experimental_compress": experimental_compress,
-        "scheduler": scheduler,
-        "strength": strength,
-        "refinement_strength": refinement_strength,
-        "inpainting_fill": inpainting_fill,
-        "mask_blur": mask_blur,
-    }
+    settings = form.to_settings()
 
     if image:
-        # Use UUID to prevent file locking issues on Windows
+        # Content-addressed names dedupe repeat uploads and never overwrite
+        # a file the worker may still be reading (Windows file locking).
         ext = Path(image.filename).suffix
         if not ext:
             ext = ".png" # default
-        unique_name = f"{uuid.uuid4()}{ext}"
-        
-        file_path = INPUTS_DIR / unique_name
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+        data = await image.read()
+        file_path = await asyncio.to_thread(_store_input, data, ext)
         settings["image"] = str(file_path.absolute())
 
     if mask:
-        unique_mask_name = f"{uuid.uuid4()}_mask.png"
-        mask_path = INPUTS_DIR / unique_mask_name
-        with open(mask_path, "wb") as buffer:
-            shutil.copyfileobj(mask.file, buffer)
+        data = await mask.read()
+        mask_path = await asyncio.to_thread(_store_input, data, "_mask.png")
         settings["mask_image"] = str(mask_path.absolute())
 
     job_id = str(uuid.uuid4())
@@ -518,7 +746,6 @@ async def generate(
         "job_id": job_id,
         "type": "batch",
         "settings": settings,
-        "future": future,
         "on_start": _mark_job_start,
         "on_finish": _mark_job_finish,
     }
@@ -526,13 +753,14 @@ async def generate(
         "job_id": job_id,
         "type": "batch",
         "status": "created",
+        "queue_position": None,
         "created_at": time.time(),
         "settings": summarize_settings(settings),
     }
 
     try:
         validate_second_pass(settings)
-        return await enqueue(job, wait_for_result=wait_for_result)
+        return await enqueue(job, wait_for_result=form.wait_for_result)
     except ValueError as e:
         return {
             "error": str(e),
@@ -548,6 +776,22 @@ async def generate(
         )
 
 
+def _remove_file(target: Path) -> bool:
+    """Unlink target if it is a regular file; False otherwise."""
+    if not target.is_file():
+        return False
+    target.unlink()
+    return True
+
+
+def _remove_dir(target: Path) -> bool:
+    """Recursively remove target if it is a directory; False otherwise."""
+    if not target.is_dir():
+        return False
+    shutil.rmtree(target)
+    return True
+
+
 @app.post("/delete_image")
 async def delete_image(path: str = Form(...)):
     """Delete an image file."""
@@ -555,11 +799,11 @@ async def delete_image(path: str = Form(...)):
         # Security check: ensure path is within BASE
         target = resolve_web_path(path)
         
-        # Double check it is actually a file
-        if not target.is_file():
+        # Check and unlink in one thread hop; refuse anything but a file
+        if not await asyncio.to_thread(_remove_file, target):
              return JSONResponse(status_code=400, content={"error": "Not a file"})
 
-        target.unlink()
+        _invalidate_gallery(target.parent.name)
         print(f"[Info] Deleted {target}")
         return {"status": "ok"}
     except Exception as e:
@@ -582,10 +826,10 @@ async def delete_run(path: str = Form(...)):
         if run_dir == BASE or not BASE in run_dir.parents:
              return JSONResponse(status_code=400, content={"error": "Invalid run directory"})
 
-        if not run_dir.exists() or not run_dir.is_dir():
+        if not await asyncio.to_thread(_remove_dir, run_dir):
              return JSONResponse(status_code=400, content={"error": "Run directory not found"})
 
-        shutil.rmtree(run_dir)
+        _invalidate_gallery(run_dir.name)
         print(f"[Info] Deleted run {run_dir}")
         return {"status": "ok"}
     except Exception as e:
@@ -593,11 +837,111 @@ async def delete_run(path: str = Form(...)):
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+@lru_cache(maxsize=4096)
+def _load_meta(path_str: str, mtime_ns: int) -> dict:
+    """Parse a run's meta.json; the mtime key drops stale entries on rewrite."""
+    return orjson.loads(Path(path_str).read_bytes())
+
+
+# Sorted run folder names, valid while BASE's mtime (runs added/removed) is unchanged.
+_gallery_cache = {"sig": None, "runs": []}
+# run name -> ((dir mtime, meta mtime), gallery entry)
+_run_cache: dict[str, tuple] = {}
+# /gallery (threadpool) and gallery_indexer (to_thread) rebuild concurrently.
+_gallery_lock = threading.Lock()
+
+
+def _invalidate_gallery(run_name: str | None = None):
+    """Drop cached gallery listings after outputs are deleted."""
+    with _gallery_lock:
+        _gallery_cache["sig"] = None
+        if run_name is not None:
+            _run_cache.pop(run_name, None)
+
+
+def _gallery_runs() -> list[str]:
+    """Run folder names, newest first."""
+    sig = BASE.stat().st_mtime_ns
+    with _gallery_lock:
+        if _gallery_cache["sig"] != sig:
+            # DirEntry.is_dir() uses the cached d_type; no per-entry stat
+            with os.scandir(BASE) as it:
+                _gallery_cache["runs"] = sorted(
+                    (item.name for item in it if item.is_dir()),
+                    reverse=True,
+                )
+            _gallery_cache["sig"] = sig
+            # Forget runs that no longer exist
+            live = set(_gallery_cache["runs"])
+            for name in [n for n in list(_run_cache) if n not in live]:
+                _run_cache.pop(name, None)
+        return _gallery_cache["runs"]
+
+
+def _gallery_entry(r: Path):
+    """Build (or reuse) the gallery entry for one run folder, or None."""
+    meta_file = r / "meta.json"
+    try:
+        stamp = (r.stat().st_mtime_ns, meta_file.stat().st_mtime_ns)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    cached = _run_cache.get(r.name)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        meta = dict(_load_meta(str(meta_file), stamp[1]))
+
+        # Fallback for old runs
+        if "timestamp" not in meta:
+            try:
+                from datetime import datetime
+                dt = datetime.strptime(r.name, "%Y-%m-%d_%H-%M-%S")
+                meta["timestamp"] = dt.timestamp()
+            except Exception:
+                pass
+
+    except Exception as e:
+        print(f"[Error] Failed to load meta for {r.name}: {e}")
+        return None
+
+    # One directory pass; files sit directly in the run, so web paths are
+    # the run prefix plus the file name.
+    prefix = to_web_path(r)
+    keyed_imgs = []
+    variants = {}
+
+    with os.scandir(r) as it:
+        for item in it:
+            name = item.name
+            if not name.endswith(".png") or not item.is_file(follow_symlinks=False):
+                continue
+            if name.endswith("_upscaled.png"):
+                variants[f"{name[:-13]}.png"] = f"{prefix}/{name}"
+                continue
+            stem = name[:-4]
+            key = (0, int(stem), "") if stem.isdigit() else (1, 0, stem)
+            keyed_imgs.append((key, f"{prefix}/{name}"))
+
+    keyed_imgs.sort()
+    imgs = [web_path for _, web_path in keyed_imgs]
+
+    entry = {
+        "run": r.name,
+        "images": imgs,
+        "variants": variants,
+        "meta": meta,
+    }
+    with _gallery_lock:
+        _run_cache[r.name] = (stamp, entry)
+    return entry
+
+
 @app.get("/gallery")
 def gallery(start: int = 0, limit: int = 50, after: float = 0.0):
     """List generated image runs with pagination."""
-    # fast scan of directories
-    runs = sorted(BASE.iterdir(), reverse=True)
+    runs = _gallery_runs()
     
     # Slice the list of folders to avoid processing everything
     # We slice slightly more than limit to account for potentially invalid folders
@@ -608,88 +952,88 @@ def gallery(start: int = 0, limit: int = 50, after: float = 0.0):
     runs_slice = runs[start : start + limit + 10] # +10 buffer for non-runs
     
     out = []
-    count = 0
     
-    for r in runs_slice:
-        if count >= limit:
+    for name in runs_slice:
+        if len(out) >= limit:
             break
-            
-        if not r.is_dir():
+
+        entry = _gallery_entry(BASE / name)
+        if entry is None:
             continue
-        meta_file = r / "meta.json"
-        if not meta_file.exists():
+
+        # Legacy 'after' filter (optional, mostly for polling)
+        if after > 0 and entry["meta"].get("timestamp", 0) <= after:
             continue
+
+        out.append(entry)
         
-        try:
-            with open(meta_file, encoding="utf-8") as f:
-                meta = json.load(f)
-                
-            # Fallback for old runs
-            if "timestamp" not in meta:
-                try:
-                    import time
-                    from datetime import datetime
-                    dt = datetime.strptime(r.name, "%Y-%m-%d_%H-%M-%S")
-                    meta["timestamp"] = dt.timestamp()
-                except Exception:
-                    pass
-            
-            # Legacy 'after' filter (optional, mostly for polling)
-            if after > 0 and meta.get("timestamp", 0) <= after:
-                continue
+    return out
 
-        except Exception as e:
-            print(f"[Error] Failed to load meta for {r.name}: {e}")
-            continue
 
-        imgs = []
-        variants = {}
+def _index_runs() -> list[str]:
+    """Warm _run_cache for the newest runs; returns their image web paths."""
+    images = []
+    for name in _gallery_runs()[:GALLERY_INDEX_RUNS]:
+        entry = _gallery_entry(BASE / name)
+        if entry is not None:
+            images.extend(entry["images"])
+    return images
 
-        for p in r.glob("*.png"):
-            if p.name.endswith("_upscaled.png"):
-                original_stem = p.name.replace("_upscaled.png", "")
-                original_name = f"{original_stem}.png"
-                variants[original_name] = to_web_path(p)
-            else:
-                imgs.append(to_web_path(p))
-        
-        def sort_key(x):
-            stem = Path(x).stem
-            if stem.isdigit():
-                return (0, int(stem), "")
-            return (1, 0, stem)
-
-        imgs.sort(key=sort_key)
-
-        out.append({
-            "run": r.name, 
-            "images": imgs, 
-            "variants": variants,
-            "meta": meta
+
+async def gallery_indexer():
+    """Precompute gallery entries and thumbnails off the request path.
+
+    Runs once at startup and again whenever a job completes. Thumbnails are
+    generated one at a time under thumb_semaphore, so user requests for
+    /thumbs are never starved.
+    """
+    while True:
+        _index_dirty.clear()
+        try:
+            images = await asyncio.to_thread(_index_runs)
+            for path in images:
+                async with thumb_semaphore:
+                    try:
+                        await asyncio.to_thread(ensure_thumbnail, path)
+                    except Exception:
+                        pass
+            # New thumbnails bump run folder mtimes; re-stamp those entries.
+            await asyncio.to_thread(_index_runs)
+        except Exception as exc:
+            print(f"[Gallery Indexer] indexing failed: {exc}")
+        await _index_dirty.wait()
+
+
+def _loras_by_arch() -> dict[str, bytes]:
+    grouped = {}
+    for name, cfg in LORA_REGISTRY.items():
+        grouped.setdefault(cfg["arch"], []).append({
+            "name": name,
+            "description": cfg.get("description", ""),
+            "weight": cfg.get("weight", 1.0),
         })
-        count += 1
-        
-    return out
+    return {arch: orjson.dumps(items) for arch, items in grouped.items()}
 
 
 @app.get("/models")
-@app.get("/models")
-def list_models():
+async def list_models():
     """List available models."""
-    return [
+    body = _catalog_cached("models", lambda: orjson.dumps([
         {
             "name": name,
             "type": info.get("type"),
             "defaults": info.get("defaults", {}),
         }
         for name, info in MODEL_REGISTRY.items()
-    ]
+    ]))
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/second_pass_models")
-def list_second_pass_models():
+async def list_second_pass_models():
     """List available second pass models."""
-    return list(MODEL_REGISTRY.keys())
+    body = _catalog_cached("model_names", lambda: orjson.dumps(list(MODEL_REGISTRY.keys())))
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/schedulers")
@@ -699,21 +1043,12 @@ def list_schedulers():
 
 
 @app.get("/models/{base_model}/loras")
-def list_model_loras(base_model: str):
-    if base_model not in MODEL_REGISTRY:
-        return []
-
-    model_arch = MODEL_REGISTRY[base_model]["arch"]
-
-    return [
-        {
-            "name": name,
-            "description": cfg.get("description", ""),
-            "weight": cfg.get("weight", 1.0),
-        }
-        for name, cfg in LORA_REGISTRY.items()
-        if cfg["arch"] == model_arch
-    ]
+async def list_model_loras(base_model: str):
+    body = b"[]"
+    if base_model in MODEL_REGISTRY:
+        model_arch = MODEL_REGISTRY[base_model]["arch"]
+        body = _catalog_cached("loras_by_arch", _loras_by_arch).get(model_arch, b"[]")
+    return Response(content=body, media_type="application/json")
 
 @app.post("/upscale")
 async def upscale(
@@ -722,16 +1057,12 @@ async def upscale(
     wait_for_result: bool = Form(True),
 ):
     """Upscale an image."""
-    loop = asyncio.get_event_loop()
-    future = loop.create_future()
-
     job_id = str(uuid.uuid4())
     job = {
         "job_id": job_id,
         "type": "upscale",
         "image": str(resolve_web_path(image)),
         "scale": scale,
-        "future": future,
         "on_start": _mark_job_start,
         "on_finish": _mark_job_finish,
     }
@@ -739,6 +1070,7 @@ async def upscale(
         "job_id": job_id,
         "type": "upscale",
         "status": "created",
+        "queue_position": None,
         "created_at": time.time(),
         "settings": {"image": image, "scale": scale},
     }
@@ -747,7 +1079,7 @@ async def upscale(
 
 
 @app.get("/queue")
-def get_queue():
+async def get_queue():
     """List active queue jobs and recent completions."""
     return build_queue_payload()
 
@@ -765,23 +1097,21 @@ async def cancel_queue_job(job_id: str = Form(...)):
             content={"error": "Job already running; queued cancellation only"}
         )
 
-    for queued_job in list(generation_queue._queue):
-        if queued_job.get("job_id") != job_id:
-            continue
+    queued_job = _leave_queue(job_id)
+    if queued_job is None:
+        return JSONResponse(status_code=409, content={"error": "Job is not queued"})
 
-        generation_queue._queue.remove(queued_job)
-        generation_queue.task_done()
+    # Leave the entry in generation_queue; the worker skips tombstones.
+    queued_job["cancelled"] = True
 
-        fut = queued_job.get("future")
-        if fut and not fut.done():
-            fut.cancel()
+    fut = queued_job.get("future")
+    if fut and not fut.done():
+        fut.cancel()
 
-        meta["status"] = "cancelled"
-        meta["finished_at"] = time.time()
-        await broadcast_queue_update()
-        return {"status": "cancelled", "job_id": job_id}
-
-    return JSONResponse(status_code=409, content={"error": "Job is not queued"})
+    meta["status"] = "cancelled"
+    meta["finished_at"] = time.time()
+    schedule_queue_update()
+    return {"status": "cancelled", "job_id": job_id}
 
 
 @app.get("/health")
@@ -797,9 +1127,7 @@ def health():
     if cuda_ok:
         vram = {
             "used_gb": round(torch.cuda.memory_allocated() / 1024**3, 2),
-            "total_gb": round(
-                torch.cuda.get_device_properties(0).total_memory / 1024**3, 2
-            ),
+            "total_gb": round(total_vram_gb(), 2),
         }
 
     return {
@@ -815,7 +1143,7 @@ def health():
             "names": list(LORA_REGISTRY.keys()),
         },
         "queue": {
-            "size": generation_queue.qsize(),
+            "size": len(queued_jobs),
             "maxsize": generation_queue.maxsize,
             "active_job_id": active_job_id,
             "tracked_jobs": len(job_registry),
@@ -830,6 +1158,54 @@ def health():
     }
 
 
+# (base_model, which) -> tokenizer. Tokenizers are small CPU objects, so each
+# model keeps its own here; the pipeline's shared cache holds only one model
+# and would reload tokenizers whenever the UI switches base models.
+_tokenizers: dict[tuple[str, str], object] = {}
+
+
+def _load_tokenizers(base_model: str):
+    """Load both tokenizers for base_model into _tokenizers."""
+    # Uncached loader: get_tokenizer's one-slot cache would evict (gc.collect,
+    # cuda.empty_cache) on every model after the first.
+    from webbduck.core.pipeline import load_tokenizers
+
+    tokenizer, tokenizer_2 = load_tokenizers(Path(MODEL_REGISTRY[base_model]["path"]))
+    _tokenizers[(base_model, "prompt")] = tokenizer
+    _tokenizers[(base_model, "prompt_2")] = tokenizer_2
+
+
+def _tokenizer_for(base_model: str, which: str):
+    """Tokenizer used for the given prompt field of base_model."""
+    key = (base_model, "prompt_2" if which == "prompt_2" else "prompt")
+    tokenizer = _tokenizers.get(key)
+    if tokenizer is None:
+        _load_tokenizers(base_model)
+        tokenizer = _tokenizers[key]
+    return tokenizer
+
+
+def _warm_tokenizers():
+    """Load tokenizers for local models so /tokenize never pays the first load."""
+    for name, info in list(MODEL_REGISTRY.items()):
+        base_path = Path(info["path"])
+        # Models without bundled tokenizers fall back to a hub download; leave those lazy.
+        if not (base_path / "tokenizer").is_dir():
+            continue
+        try:
+            _load_tokenizers(name)
+        except Exception as exc:
+            print(f"[Tokenizer] Warmup failed for {name}: {exc}")
+
+
+@lru_cache(maxsize=2048)
+def _count_tokens(base_model: str, which: str, text: str) -> int:
+    """Token count for text under the base model's tokenizer (memoized)."""
+    from webbduck.prompt.management import tokenize_len
+
+    return tokenize_len(_tokenizer_for(base_model, which), text)
+
+
 @app.post("/tokenize")
 async def tokenize_prompt(
     text: str = Form(""),
@@ -837,31 +1213,12 @@ async def tokenize_prompt(
     which: str = Form("prompt"),
 ):
     """Count tokens in prompt."""
-    from webbduck.core.pipeline import get_tokenizer
-    from webbduck.models.registry import MODEL_REGISTRY
-    
-    # Get model path directly
-    base_entry = MODEL_REGISTRY[base_model]
-    base_path = base_entry["path"]
-    
-    # Use lightweight tokenizer loader
-    tokenizer, tokenizer_2 = get_tokenizer(base_path)
-
-    active_tokenizer = (
-        tokenizer_2 if which == "prompt_2"
-        else tokenizer
-    )
-
-    tokens = tokenizer(
-        text,
-        truncation=False,
-        add_special_tokens=True,
-    )["input_ids"]
+    count = _count_tokens(base_model, which, text)
 
     return {
-        "tokens": len(tokens),
+        "tokens": count,
         "limit": 77,
-        "over": max(0, len(tokens) - 77),
+        "over": max(0, count - 77),
     }
 
 
@@ -907,8 +1264,7 @@ async def caption_image(
     file_path = INPUTS_DIR / unique_name
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+        await _save_upload(image, file_path)
         
         # Update UI status
         update_stage("Captioning")
@@ -923,13 +1279,12 @@ async def caption_image(
             
             # Only offload if there's actually a pipeline loaded on GPU
             try:
-                from webbduck.core.pipeline import pipeline_manager
+                from webbduck.core.pipeline import pipeline_manager, offload_to_cpu
                 if pipeline_manager.pipe is not None and hasattr(pipeline_manager.pipe, 'unet'):
                     # Check if UNet is actually on CUDA before offloading
                     unet_device = next(pipeline_manager.pipe.unet.parameters()).device
                     if unet_device.type == 'cuda':
-                        pipeline_manager.pipe.unet.to('cpu')
-                        pipeline_manager.pipe.vae.to('cpu')
+                        offload_to_cpu(pipeline_manager.pipe.unet, pipeline_manager.pipe.vae)
                         torch.cuda.empty_cache()
                         gc.collect()
             except Exception:
@@ -944,8 +1299,7 @@ async def caption_image(
             )
         
         # Run captioning in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        caption = await loop.run_in_executor(None, offload_and_caption)
+        caption = await asyncio.to_thread(offload_and_caption)
         
         update_stage("Idle")
         update_progress(1.0)
@@ -972,18 +1326,16 @@ async def caption_image(
 
 
 @app.get("/thumbs/{path:path}")
-async def get_thumbnail(path: str):
+async def get_thumbnail(path: str, request: Request):
     """Serve a thumbnail, generating it on demand if needed."""
     try:
         async with thumb_semaphore:
             # Run resizing in thread pool to avoid blocking event loop
-            loop = asyncio.get_event_loop()
-            thumb_path = await loop.run_in_executor(None, ensure_thumbnail, path)
-        response = FileResponse(thumb_path)
-        # Smaller chunks reduce peak per-request memory under high concurrency.
-        response.chunk_size = 16 * 1024
-        response.headers["Cache-Control"] = "public, max-age=86400"
-        return response
+            data, etag = await asyncio.to_thread(load_thumbnail, path)
+        headers = {"Cache-Control": "public, max-age=86400", "ETag": etag}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=data, media_type="image/jpeg", headers=headers)
     except FileNotFoundError:
         return JSONResponse(status_code=404, content={"error": "Image not found"})
     except Exception as e:
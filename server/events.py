@@ -1,25 +1,93 @@
-"""WebSocket event broadcasting."""
+"""WebSocket event broadcasting.
 
-import json
+Each event is encoded once and queued for every client; per-client sender
+tasks then write concurrently, so sends overlap without awaiting a gather.
+"""
 
-active_sockets = set()
+import asyncio
+
+import orjson
+from fastapi import WebSocket
+
+# Per-client outgoing queue size; a stalled client never blocks the others.
+SOCKET_QUEUE_SIZE = 64
+
+# WebSocket -> asyncio.Queue of (event type, encoded message). Dead clients
+# are removed by their own sender task, so broadcasts never prune.
+active_sockets: dict[WebSocket, asyncio.Queue] = {}
+
+
+def _offer(out_q: asyncio.Queue, kind: str, message: bytes):
+    """Queue a message without waiting, shedding load when the client lags."""
+    try:
+        out_q.put_nowait((kind, message))
+        return
+    except asyncio.QueueFull:
+        pass
+
+    # Make room by evicting the oldest queued state frame, which the next
+    # sampler tick supersedes. Without one, an incoming state frame is the
+    # cheapest loss; any other frame displaces the oldest queued frame.
+    pending = [out_q.get_nowait() for _ in range(out_q.qsize())]
+    victim = next((i for i, (k, _) in enumerate(pending) if k == "state"), None)
+    if victim is not None:
+        del pending[victim]
+        pending.append((kind, message))
+    elif kind != "state":
+        del pending[0]
+        pending.append((kind, message))
+
+    for item in pending:
+        out_q.put_nowait(item)
+
+
+async def socket_sender(ws, out_q: asyncio.Queue):
+    """Drain one client's outgoing queue onto its socket."""
+    try:
+        while True:
+            _, message = await out_q.get()
+            await ws.send_bytes(message)
+    except Exception:
+        active_sockets.pop(ws, None)
+
+
+def register_socket(ws) -> asyncio.Task:
+    """Start fan-out to a connected client; returns its sender task."""
+    out_q = asyncio.Queue(maxsize=SOCKET_QUEUE_SIZE)
+    active_sockets[ws] = out_q
+    return asyncio.create_task(socket_sender(ws, out_q))
+
+
+def unregister_socket(ws, sender: asyncio.Task):
+    """Stop fan-out to a disconnected client."""
+    active_sockets.pop(ws, None)
+    sender.cancel()
+
+
+def serialize(event: dict) -> bytes:
+    """Encode an event once for every client (UTF-8 JSON, sent as binary)."""
+    return orjson.dumps(event)
+
+
+async def broadcast_bytes(kind: str, message: bytes):
+    """Fan a pre-serialized event out to all connected WebSocket clients."""
+    # _offer never awaits, so the dict cannot change mid-loop; no snapshot.
+    for out_q in active_sockets.values():
+        _offer(out_q, kind, message)
 
 
 async def broadcast(event: dict):
     """Broadcast event to all connected WebSocket clients."""
-    dead = []
-    for ws in list(active_sockets):
-        try:
-            await ws.send_text(json.dumps(event))
-        except Exception:
-            dead.append(ws)
-    for d in dead:
-        active_sockets.discard(d)
+    if not active_sockets:
+        return
+    await broadcast_bytes(event.get("type"), serialize(event))
 
 
 async def broadcast_state(state):
     """Broadcast state update."""
+    if not active_sockets:
+        return
     await broadcast({
         "type": "state",
         **state
-    })
\ No newline at end of file
+    })
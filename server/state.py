@@ -15,6 +15,8 @@ state = {
     "last_update": time.time(),
 }
 
+_total_vram_gb = None
+
 
 def update_stage(stage: str):
     """Update current processing stage."""
@@ -30,18 +32,28 @@ def update_progress(p: float, step: int = 0, total_steps: int = 0):
     state["last_update"] = time.time()
 
 
+def total_vram_gb() -> float:
+    """Total memory of device 0 in GB (static, queried once)."""
+    global _total_vram_gb
+    if _total_vram_gb is None:
+        _total_vram_gb = torch.cuda.get_device_properties(0).total_memory / 1024**3
+    return _total_vram_gb
+
+
 def update_vram():
     """Update VRAM usage stats."""
     if not torch.cuda.is_available():
         return
     state["vram"] = {
         "used": torch.cuda.memory_allocated() / 1024**3,
-        "total": torch.cuda.get_device_properties(0).total_memory / 1024**3,
+        "total": total_vram_gb(),
     }
     state["last_update"] = time.time()
 
 
 def snapshot():
-    """Get current state snapshot."""
-    update_vram()
+    """Get current state snapshot.
+
+    Does not touch CUDA; VRAM figures are refreshed by vram_sampler.
+    """
     return dict(state)
\ No newline at end of file
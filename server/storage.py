@@ -1,11 +1,13 @@
 """Image and session storage."""
 
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import os
 
+import orjson
+
 # Check for custom output directory from environment variable
 custom_out = os.environ.get("WEBBDUCK_OUTPUT_DIR")
 if custom_out:
@@ -16,12 +18,28 @@ else:
 
 
 BASE.mkdir(exist_ok=True, parents=True)
+BASE_RESOLVED = BASE.resolve()
+
+# zlib level for output PNGs; 1 encodes several times faster than PIL's
+# default of 6 for a modestly larger file.
+PNG_COMPRESS_LEVEL = int(os.environ.get("WEBBDUCK_PNG_COMPRESS_LEVEL", "1"))
+
+
+# Both spellings of BASE a caller may build paths from (absolute, or as given)
+_BASE_PREFIXES = tuple({str(BASE_RESOLVED) + os.sep, str(BASE) + os.sep})
 
 
 def to_web_path(path: Path) -> str:
     """Convert valid filesystem path to web-accessible path."""
+    # Fast path: plain string arithmetic for paths already under BASE
+    path_str = str(path)
+    if ".." not in path_str:
+        for prefix in _BASE_PREFIXES:
+            if path_str.startswith(prefix):
+                return "outputs/" + path_str[len(prefix):].replace(os.sep, "/")
+
     try:
-        rel = path.resolve().relative_to(BASE.resolve())
+        rel = path.resolve().relative_to(BASE_RESOLVED)
         return f"outputs/{rel.as_posix()}"
     except ValueError:
         return f"outputs/{path.name}"
@@ -44,42 +62,45 @@ def save_images(images, settings):
     run = BASE / time.strftime("%Y-%m-%d_%H-%M-%S")
     run.mkdir()
 
-    paths = []
-    for i, img in enumerate(images):
-        p = run / f"{i}.png"
-        img.save(p)
-        paths.append(to_web_path(p))
-
-    with open(run / "meta.json", "w") as f:
-        # Sanitize settings for JSON (remove PIL Image objects)
-        clean_settings = settings.copy()
-        if "input_image" in clean_settings:
-            del clean_settings["input_image"]
-        if "mask_image" in clean_settings:
-            del clean_settings["mask_image"]
-        
-        # Add timestamp if not present
-        if "timestamp" not in clean_settings:
-            clean_settings["timestamp"] = time.time()
-            
-        json.dump(clean_settings, f, indent=2)
+    files = [run / f"{i}.png" for i in range(len(images))]
+
+    def save(i):
+        images[i].save(files[i], compress_level=PNG_COMPRESS_LEVEL)
+
+    # zlib releases the GIL, so batch images encode in parallel
+    if len(images) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1)) as ex:
+            list(ex.map(save, range(len(images))))
+    else:
+        for i in range(len(images)):
+            save(i)
+
+    paths = [to_web_path(p) for p in files]
+
+    # Sanitize settings for JSON (remove PIL Image objects)
+    clean_settings = settings.copy()
+    if "input_image" in clean_settings:
+        del clean_settings["input_image"]
+    if "mask_image" in clean_settings:
+        del clean_settings["mask_image"]
+
+    # Add timestamp if not present
+    if "timestamp" not in clean_settings:
+        clean_settings["timestamp"] = time.time()
+
+    (run / "meta.json").write_bytes(orjson.dumps(clean_settings, option=orjson.OPT_INDENT_2))
 
 
     return paths
 
 
 
-SESSION_LOG = BASE / "session_log.json"
+SESSION_LOG = BASE / "session_log.jsonl"
 
 
 def append_session_entry(entry: dict):
-    """Append entry to session log."""
+    """Append entry to session log (one JSON object per line)."""
     SESSION_LOG.parent.mkdir(exist_ok=True)
 
-    if SESSION_LOG.exists():
-        data = json.loads(SESSION_LOG.read_text())
-    else:
-        data = []
-
-    data.append(entry)
-    SESSION_LOG.write_text(json.dumps(data, indent=2))
\ No newline at end of file
+    with open(SESSION_LOG, "ab") as f:
+        f.write(orjson.dumps(entry) + b"\n")
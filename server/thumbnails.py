@@ -1,5 +1,6 @@
 """Thumbnail generation logic."""
 
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image
 
@@ -8,6 +9,7 @@ from webbduck.server.storage import BASE, resolve_web_path
 THUMB_SUFFIX = ".thumb.jpg"
 THUMB_SIZE = (512, 512)
 THUMB_QUALITY = 85
+THUMB_CACHE_SIZE = 1024
 
 def get_thumbnail_path(original_path: Path) -> Path:
     """Get expected thumbnail path for an image."""
@@ -47,3 +49,16 @@ def ensure_thumbnail(web_path: str) -> Path:
         if thumb_path.exists():
             return thumb_path
         raise
+
+
+@lru_cache(maxsize=THUMB_CACHE_SIZE)
+def _thumb_bytes(path_str: str, mtime_ns: int) -> bytes:
+    """Thumbnail file contents; the mtime key drops entries on regeneration."""
+    return Path(path_str).read_bytes()
+
+
+def load_thumbnail(web_path: str) -> tuple[bytes, str]:
+    """Ensure a thumbnail exists; return its JPEG bytes (LRU cached) and ETag."""
+    thumb_path = ensure_thumbnail(web_path)
+    mtime_ns = thumb_path.stat().st_mtime_ns
+    return _thumb_bytes(str(thumb_path), mtime_ns), f'"{mtime_ns:x}"'
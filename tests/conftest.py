@@ -1,12 +1,37 @@
 """Pytest configuration and shared fixtures for webbduck tests."""
 
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 import pytest
 from pathlib import Path
+from urllib.parse import urlsplit
 from PIL import Image
 
 # Test assets directory
 TESTS_DIR = Path(__file__).parent
 TEST_IMAGE_PATH = TESTS_DIR / "test.jpg"
+# Canned API responses (captured from a live server) for browser tests
+FIXTURES_DIR = TESTS_DIR / "fixtures"
+
+# Browser tests talk to a live server; each xdist worker gets its own port.
+UI_BASE_PORT = 8000
+# On-disk cache of static UI assets for browser tests, keyed by UI_DIR state.
+UI_DIR = TESTS_DIR.parent / "ui"
+STATIC_CACHE_DIR = TESTS_DIR / ".cache_static"
+# UI assets only; /outputs and /thumbs images change with the gallery, not ui/.
+STATIC_ASSET_GLOB = "**/ui/**/*.{js,css,woff2,png,webp,json,ico}"
+# Media the read-only sanity page never inspects (icons, thumbnails, fonts).
+BLOCKED_ASSET_GLOB = "**/*.{png,jpg,jpeg,gif,webp,svg,ico,woff,woff2}"
+# Browser profiles (HTTP cache, compiled JS) kept between runs, one per worker.
+BROWSER_PROFILE_DIR = TESTS_DIR / ".pw-profile"
+# Per-run browser timing report, written by the ui_perf fixture.
+UI_PERF_REPORT = TESTS_DIR / "test-artifacts" / "ui_perf.json"
 
 
 @pytest.fixture(scope="session")
@@ -25,6 +50,12 @@ def test_image_path():
     return TEST_IMAGE_PATH
 
 
+@pytest.fixture(scope="session")
+def test_image_bytes(test_image_path):
+    """Raw test image bytes, read once; wrap in BytesIO per upload."""
+    return test_image_path.read_bytes()
+
+
 @pytest.fixture
 def basic_settings():
     """Minimal settings dict for text2img generation."""
@@ -98,9 +129,269 @@ def first_available_model(available_models):
     return next(iter(available_models.keys()))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def second_pass_model(available_models):
+    """Find a second pass model if available."""
+    for name in available_models.keys():
+        if "refiner" in name.lower():
+            return name
+    # If no refiner, use first available as fallback
+    if len(available_models) > 1:
+        models = list(available_models.keys())
+        return models[1]
+    pytest.skip("No second pass model available")
+
+
+@pytest.fixture(scope="session")
+def warm_pipeline(first_available_model):
+    """Load the base model pipelines once for the whole session."""
+    from webbduck.core.pipeline import pipeline_manager
+
+    pipeline_manager.get(base_model=first_available_model, second_pass_model=None, loras=[])
+    yield pipeline_manager
+
+    # Release VRAM once at session end rather than after every test
+    import torch
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+@pytest.fixture(scope="session")
+def warm_two_pass_pipeline(warm_pipeline, first_available_model, second_pass_model):
+    """Additionally load the second pass model once for the whole session."""
+    warm_pipeline.get(
+        base_model=first_available_model,
+        second_pass_model=second_pass_model,
+        loras=[],
+    )
+    return warm_pipeline
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create test client for FastAPI app (shared fixture)."""
+    """Create test client for FastAPI app (shared fixture).
+
+    Not entered as a context manager, so startup tasks (GPU worker, samplers,
+    gallery indexer) never run for plain endpoint tests.
+    """
     from fastapi.testclient import TestClient
     from webbduck.server.app import app
     return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def live_client():
+    """Test client with app startup run once per session, for tests that need the GPU worker."""
+    from fastapi.testclient import TestClient
+    from webbduck.server.app import app
+    with TestClient(app) as c:
+        yield c
+
+
+def _xdist_worker_index() -> int:
+    """0 for plain runs, N for pytest-xdist worker gwN."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    return int(worker[2:]) if worker.startswith("gw") else 0
+
+
+@pytest.fixture(scope="session")
+def ui_base_url():
+    """URL of a WebbDuck server for browser tests.
+
+    Serves the app in-process on a per-worker port (8000 + N for xdist
+    worker gwN). Set WEBBDUCK_UI_URL to test an already running server.
+    Ports stay fixed rather than ephemeral because the browser profile's
+    HTTP cache is keyed by origin.
+    """
+    external = os.environ.get("WEBBDUCK_UI_URL")
+    if external:
+        yield external.rstrip("/")
+        return
+
+    port = UI_BASE_PORT + _xdist_worker_index()
+    url = f"http://127.0.0.1:{port}"
+
+    import uvicorn
+    from webbduck.server.app import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            pytest.fail(f"UI server failed to start on port {port} (in use? set WEBBDUCK_UI_URL)")
+        time.sleep(0.05)
+
+    yield url
+
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+@pytest.fixture(scope="session")
+def persistent_context(browser_type, browser_type_launch_args):
+    """Browser context on a persistent profile, shared by the session."""
+    profile = BROWSER_PROFILE_DIR / f"worker-{_xdist_worker_index()}"
+    context = browser_type.launch_persistent_context(
+        user_data_dir=str(profile),
+        **browser_type_launch_args,
+    )
+    yield context
+    context.close()
+
+
+@pytest.fixture
+def context(persistent_context):
+    """Override pytest-playwright's per-test context with the persistent one.
+
+    Cookies are cleared between tests; storage and the HTTP cache are kept.
+    """
+    before = set(persistent_context.pages)
+    yield persistent_context
+    # Close only this test's pages; the session-wide shared_page stays open.
+    for page in persistent_context.pages:
+        if page not in before:
+            page.close()
+    persistent_context.clear_cookies()
+
+
+@pytest.fixture(scope="session")
+def static_cache_dir():
+    """Cache directory for the current UI assets; edits to ui/ start a new one."""
+    digest = hashlib.md5()
+    for path in sorted(UI_DIR.rglob("*")):
+        if path.is_file():
+            stat = path.stat()
+            digest.update(f"{path.relative_to(UI_DIR)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    cache_dir = STATIC_CACHE_DIR / digest.hexdigest()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+@pytest.fixture
+def cached_page(page, static_cache_dir):
+    """Playwright page that serves static assets from the on-disk cache."""
+    _serve_static_from_cache(page, static_cache_dir)
+    _attach_browser_logging(page)
+    return page
+
+
+@pytest.fixture(scope="session")
+def _ui_session(persistent_context, static_cache_dir, ui_base_url, ui_perf):
+    """Navigate one UI page; yields (page, {endpoint: catalog response}).
+
+    /models and /schedulers are answered from tests/fixtures, so the page
+    never waits on registry scans; see test_ui_populates_selects_live.
+    """
+    page = persistent_context.new_page()
+    _serve_static_from_cache(page, static_cache_dir)
+    # Registered last, so these take precedence over the cache route
+    page.route(BLOCKED_ASSET_GLOB, lambda route: route.abort())
+    _serve_catalog_fixtures(page)
+    _attach_browser_logging(page)
+
+    # Return once the HTML starts arriving, then block on the two catalog
+    # responses as events rather than polling the DOM. (networkidle would
+    # also wait for every gallery thumbnail.)
+    with ui_perf.measure("goto"), \
+         page.expect_response(lambda r: r.url.endswith("/models"), timeout=15000) as models, \
+         page.expect_response(lambda r: r.url.endswith("/schedulers"), timeout=15000) as schedulers:
+        page.goto(ui_base_url, wait_until="commit")
+
+    yield page, {"models": models.value, "schedulers": schedulers.value}
+    page.close()
+
+
+class UIPerf:
+    """Wall-clock timings of browser test steps, in seconds."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.navigation = []
+
+    @contextmanager
+    def measure(self, step: str):
+        """Record how long the with-block takes under step."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.metrics[step] = time.perf_counter() - start
+
+    @property
+    def total(self) -> float:
+        return sum(self.metrics.values())
+
+
+@pytest.fixture(scope="session")
+def ui_perf():
+    """Collect browser step timings; written to UI_PERF_REPORT at session end."""
+    perf = UIPerf()
+    yield perf
+
+    UI_PERF_REPORT.parent.mkdir(parents=True, exist_ok=True)
+    UI_PERF_REPORT.write_text(json.dumps({
+        "metrics": perf.metrics,
+        "total": perf.total,
+        "navigation": perf.navigation,
+    }, indent=2))
+
+
+@pytest.fixture(scope="session")
+def shared_page(_ui_session):
+    """One UI page, navigated once, shared by the read-only browser tests.
+
+    Ready once the /models and /schedulers responses have arrived.
+    """
+    return _ui_session[0]
+
+
+@pytest.fixture(scope="session")
+def catalog_responses(_ui_session):
+    """The (fixture-backed) /models and /schedulers responses of shared_page."""
+    return _ui_session[1]
+
+
+def _attach_browser_logging(page):
+    """Print page errors; console and network logging only with DEBUG_BROWSER.
+
+    pageerror only fires on failures, so it costs nothing on green runs. The
+    console/response listeners fire for every message and asset.
+    """
+    page.on("pageerror", lambda exc: print(f"BROWSER ERROR: {exc}"))
+    if os.getenv("DEBUG_BROWSER"):
+        page.on("console", lambda msg: print(f"BROWSER CONSOLE: {msg.text}"))
+        page.on("response", lambda response: print(f"NETWORK: {response.status} {response.url}"))
+
+
+def _serve_catalog_fixtures(page):
+    """Answer the catalog endpoints from tests/fixtures/<endpoint>.json."""
+    for endpoint in ("models", "schedulers"):
+        fixture = FIXTURES_DIR / f"{endpoint}.json"
+        page.route(f"**/{endpoint}", lambda route, fixture=fixture: route.fulfill(path=fixture))
+
+
+def _serve_static_from_cache(page, cache_dir: Path):
+    """Route page's static asset requests through the on-disk cache."""
+    def serve(route):
+        url = route.request.url
+        # Key on path and query only, so every worker's origin shares entries
+        parts = urlsplit(url)
+        cached = cache_dir / hashlib.md5(f"{parts.path}?{parts.query}".encode()).hexdigest()
+        if cached.exists():
+            route.fulfill(body=cached.read_bytes(), headers={"content-type": _content_type(url)})
+            return
+
+        response = route.fetch()
+        body = response.body()
+        if response.ok:
+            cached.write_bytes(body)
+        route.fulfill(response=response, body=body)
+
+    page.route(STATIC_ASSET_GLOB, serve)
+
+
+def _content_type(url: str) -> str:
+    """MIME type for a cached asset, from its URL."""
+    path = url.split("?", 1)[0]
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
@@ -1,20 +1,30 @@
 """Integration tests for image generation (require GPU and models)."""
 
+import numpy as np
 import pytest
 from pathlib import Path
 from PIL import Image
 
+pytest.importorskip("torch")
+
+# core.generation imports webbduck.server.state, and the server package init
+# loads app -> worker -> core.generation; load the server first to break the cycle.
+import webbduck.server  # noqa: F401
+from webbduck.core.generation import run_generation
+
 
 @pytest.mark.slow
+@pytest.mark.xdist_group("gpu")
 class TestText2ImgGeneration:
     """Text-to-image generation tests."""
 
-    def test_text2img_basic(self, basic_settings, first_available_model):
+    def test_text2img_basic(self, basic_settings, first_available_model, warm_pipeline):
         """Test basic text2img generation."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["input_image"] = None
         
         images, seed = run_generation(settings)
@@ -24,24 +34,24 @@ class TestText2ImgGeneration:
         assert all(isinstance(img, Image.Image) for img in images)
         assert seed is not None
 
-    def test_text2img_multiple_images(self, basic_settings, first_available_model):
+    def test_text2img_multiple_images(self, basic_settings, first_available_model, warm_pipeline):
         """Test generating multiple images."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["num_images"] = 2
         
         images, seed = run_generation(settings)
         
         assert len(images) == 2
 
-    def test_text2img_custom_size(self, basic_settings, first_available_model):
+    def test_text2img_custom_size(self, basic_settings, first_available_model, warm_pipeline):
         """Test custom output dimensions."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
         settings["width"] = 768
         settings["height"] = 512
         
@@ -49,13 +59,12 @@ class TestText2ImgGeneration:
         
         assert images[0].size == (768, 512)
 
-    def test_text2img_seed_reproducibility(self, basic_settings, first_available_model):
+    def test_text2img_seed_reproducibility(self, basic_settings, first_available_model, warm_pipeline):
         """Test that same seed produces same result."""
-        from webbduck.core.generation import run_generation
-        import numpy as np
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        # Only determinism matters here, not image quality
+        settings["steps"] = 4
         settings["seed"] = 12345
         
         images1, seed1 = run_generation(settings)
@@ -69,15 +78,17 @@ class TestText2ImgGeneration:
 
 
 @pytest.mark.slow
+@pytest.mark.xdist_group("gpu")
 class TestImg2ImgGeneration:
     """Image-to-image generation tests."""
 
-    def test_img2img_basic(self, basic_settings, first_available_model, test_image):
+    def test_img2img_basic(self, basic_settings, first_available_model, test_image, warm_pipeline):
         """Test basic img2img generation."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["input_image"] = test_image
         settings["strength"] = 0.75
         
@@ -87,12 +98,11 @@ class TestImg2ImgGeneration:
         assert len(images) == 1
         assert isinstance(images[0], Image.Image)
 
-    def test_img2img_preserves_size(self, basic_settings, first_available_model, test_image):
+    def test_img2img_preserves_size(self, basic_settings, first_available_model, test_image, warm_pipeline):
         """Img2img should use the specified dimensions."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
         settings["input_image"] = test_image
         settings["width"] = 768
         settings["height"] = 768
@@ -103,24 +113,27 @@ class TestImg2ImgGeneration:
         # Should match requested dimensions, not input image size
         assert images[0].size == (768, 768)
 
-    def test_img2img_low_strength(self, basic_settings, first_available_model, test_image):
+    def test_img2img_low_strength(self, basic_settings, first_available_model, test_image, warm_pipeline):
         """Low strength should preserve more of original."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        # img2img runs int(steps * strength) steps; keep that at least 1
+        settings["steps"] = 10
+        settings["width"] = 256
+        settings["height"] = 256
         settings["input_image"] = test_image
         settings["strength"] = 0.1  # Very low - should be close to original
         
         images, seed = run_generation(settings)
         assert images is not None
 
-    def test_img2img_high_strength(self, basic_settings, first_available_model, test_image):
+    def test_img2img_high_strength(self, basic_settings, first_available_model, test_image, warm_pipeline):
         """High strength should allow more changes."""
-        from webbduck.core.generation import run_generation
-        
         settings = basic_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["input_image"] = test_image
         settings["strength"] = 0.95
         
@@ -129,49 +142,54 @@ class TestImg2ImgGeneration:
 
 
 @pytest.mark.slow
+@pytest.mark.xdist_group("gpu")
 class TestInpaintGeneration:
     """Inpainting generation tests."""
 
-    def test_inpaint_basic(self, inpaint_settings, first_available_model):
+    def test_inpaint_basic(self, inpaint_settings, first_available_model, warm_pipeline):
         """Test basic inpainting."""
-        from webbduck.core.generation import run_generation
-        
         settings = inpaint_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         
         images, seed = run_generation(settings)
         
         assert images is not None
         assert len(images) == 1
 
-    def test_inpaint_replace_mode(self, inpaint_settings, first_available_model):
+    def test_inpaint_replace_mode(self, inpaint_settings, first_available_model, warm_pipeline):
         """Test inpainting with replace mode."""
-        from webbduck.core.generation import run_generation
-        
         settings = inpaint_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["inpainting_fill"] = "replace"
         
         images, seed = run_generation(settings)
         assert images is not None
 
-    def test_inpaint_keep_mode(self, inpaint_settings, first_available_model):
+    def test_inpaint_keep_mode(self, inpaint_settings, first_available_model, warm_pipeline):
         """Test inpainting with keep mode (inverted mask)."""
-        from webbduck.core.generation import run_generation
-        
         settings = inpaint_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["inpainting_fill"] = "keep"
         
         images, seed = run_generation(settings)
         assert images is not None
 
-    def test_inpaint_with_mask_blur(self, inpaint_settings, first_available_model):
+    def test_inpaint_with_mask_blur(self, inpaint_settings, first_available_model, warm_pipeline):
         """Test inpainting with mask blur."""
-        from webbduck.core.generation import run_generation
-        
         settings = inpaint_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 2
+        settings["width"] = 256
+        settings["height"] = 256
         settings["mask_blur"] = 16
         
         images, seed = run_generation(settings)
@@ -179,29 +197,21 @@ class TestInpaintGeneration:
 
 
 @pytest.mark.slow
+@pytest.mark.xdist_group("gpu")
 class TestTwoPassGeneration:
     """Two-pass (refiner) generation tests."""
 
-    @pytest.fixture
-    def second_pass_model(self, available_models):
-        """Find a second pass model if available."""
-        for name in available_models.keys():
-            if "refiner" in name.lower():
-                return name
-        # If no refiner, use first available as fallback
-        if len(available_models) > 1:
-            models = list(available_models.keys())
-            return models[1]
-        pytest.skip("No second pass model available")
-
     def test_two_pass_basic(
-        self, two_pass_settings, first_available_model, second_pass_model
+        self, two_pass_settings, first_available_model, second_pass_model,
+        warm_two_pass_pipeline,
     ):
         """Test two-pass generation."""
-        from webbduck.core.generation import run_generation
-        
         settings = two_pass_settings.copy()
         settings["base_model"] = first_available_model
+        # Refiner runs int(int(steps * 0.7) * refinement_strength) steps
+        settings["steps"] = 6
+        settings["width"] = 256
+        settings["height"] = 256
         settings["second_pass_model"] = second_pass_model
         
         images, seed = run_generation(settings)
@@ -210,13 +220,15 @@ class TestTwoPassGeneration:
         assert len(images) == 1
 
     def test_two_pass_auto_mode(
-        self, two_pass_settings, first_available_model, second_pass_model
+        self, two_pass_settings, first_available_model, second_pass_model,
+        warm_two_pass_pipeline,
     ):
         """Test two-pass with auto mode selection."""
-        from webbduck.core.generation import run_generation
-        
         settings = two_pass_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 6
+        settings["width"] = 256
+        settings["height"] = 256
         settings["second_pass_model"] = second_pass_model
         settings["second_pass_mode"] = "auto"
         
@@ -224,13 +236,15 @@ class TestTwoPassGeneration:
         assert images is not None
 
     def test_two_pass_img2img_mode(
-        self, two_pass_settings, first_available_model, second_pass_model
+        self, two_pass_settings, first_available_model, second_pass_model,
+        warm_two_pass_pipeline,
     ):
         """Test two-pass with explicit img2img mode."""
-        from webbduck.core.generation import run_generation
-        
         settings = two_pass_settings.copy()
         settings["base_model"] = first_available_model
+        settings["steps"] = 6
+        settings["width"] = 256
+        settings["height"] = 256
         settings["second_pass_model"] = second_pass_model
         settings["second_pass_mode"] = "img2img"
         
@@ -1,29 +1,30 @@
 """Tests for the generation mode selection system."""
 
+import inspect
+
 import pytest
 from unittest.mock import Mock, MagicMock
 
+from webbduck.modes import select_mode
+from webbduck.modes.text2img import Text2ImgMode
+from webbduck.modes.img2img import Img2ImgMode
+from webbduck.modes.two_pass import TwoPassMode
+from webbduck.modes.inpaint import InpaintMode
+
 
 class TestModeSelection:
     """Test mode selection logic without GPU."""
 
     def test_mode_classes_can_be_imported(self):
         """Verify all mode classes can be imported directly."""
-        from webbduck.modes.text2img import Text2ImgMode
-        from webbduck.modes.img2img import Img2ImgMode
-        from webbduck.modes.two_pass import TwoPassMode
-        from webbduck.modes.inpaint import InpaintMode
-        
         assert all([Text2ImgMode, Img2ImgMode, TwoPassMode, InpaintMode])
 
     def test_select_mode_can_be_imported(self):
         """Verify select_mode can be imported."""
-        from webbduck.modes import select_mode
         assert callable(select_mode)
 
     def test_text2img_can_run_no_image(self, basic_settings):
         """Text2Img should run when no input_image is set."""
-        from webbduck.modes.text2img import Text2ImgMode
         mode = Text2ImgMode()
         
         settings = basic_settings.copy()
@@ -33,7 +34,6 @@ class TestModeSelection:
 
     def test_text2img_cannot_run_with_image(self, basic_settings):
         """Text2Img should not run when input_image is present."""
-        from webbduck.modes.text2img import Text2ImgMode
         mode = Text2ImgMode()
         
         settings = basic_settings.copy()
@@ -43,7 +43,6 @@ class TestModeSelection:
 
     def test_img2img_can_run_with_image(self, basic_settings):
         """Img2Img should run when input_image is present."""
-        from webbduck.modes.img2img import Img2ImgMode
         mode = Img2ImgMode()
         
         settings = basic_settings.copy()
@@ -53,7 +52,6 @@ class TestModeSelection:
 
     def test_img2img_cannot_run_without_image(self, basic_settings):
         """Img2Img should not run when no input_image."""
-        from webbduck.modes.img2img import Img2ImgMode
         mode = Img2ImgMode()
         
         settings = basic_settings.copy()
@@ -63,7 +61,6 @@ class TestModeSelection:
 
     def test_inpaint_requires_mask_and_image(self, basic_settings):
         """Inpaint mode should require both mask and input image."""
-        from webbduck.modes.inpaint import InpaintMode
         mode = InpaintMode()
         
         # Neither mask nor image
@@ -88,7 +85,6 @@ class TestModeSelection:
 
     def test_two_pass_requires_second_pass_model(self, basic_settings):
         """TwoPass mode should require a second_pass_model."""
-        from webbduck.modes.two_pass import TwoPassMode
         mode = TwoPassMode()
         
         settings = basic_settings.copy()
@@ -115,9 +111,6 @@ class TestModeSelection:
 
     def test_mode_priority_inpaint_over_img2img(self, basic_settings):
         """Inpaint should be selected over Img2Img when mask is present."""
-        from webbduck.modes import select_mode
-        from webbduck.modes.inpaint import InpaintMode
-        
         settings = basic_settings.copy()
         settings["input_image"] = Mock()
         settings["mask_image"] = Mock()
@@ -127,9 +120,6 @@ class TestModeSelection:
 
     def test_mode_priority_img2img_without_mask(self, basic_settings):
         """Img2Img should be selected when image but no mask."""
-        from webbduck.modes import select_mode
-        from webbduck.modes.img2img import Img2ImgMode
-        
         settings = basic_settings.copy()
         settings["input_image"] = Mock()
         settings["mask_image"] = None
@@ -139,9 +129,6 @@ class TestModeSelection:
 
     def test_mode_priority_text2img_fallback(self, basic_settings):
         """Text2Img should be fallback when no image."""
-        from webbduck.modes import select_mode
-        from webbduck.modes.text2img import Text2ImgMode
-        
         settings = basic_settings.copy()
         settings["input_image"] = None
         
@@ -154,11 +141,6 @@ class TestModeSignatures:
 
     def test_all_modes_have_can_run(self):
         """All modes should have can_run method."""
-        from webbduck.modes.text2img import Text2ImgMode
-        from webbduck.modes.img2img import Img2ImgMode
-        from webbduck.modes.two_pass import TwoPassMode
-        from webbduck.modes.inpaint import InpaintMode
-        
         for cls in [Text2ImgMode, Img2ImgMode, TwoPassMode, InpaintMode]:
             mode = cls()
             assert hasattr(mode, "can_run")
@@ -166,11 +148,6 @@ class TestModeSignatures:
 
     def test_all_modes_have_run(self):
         """All modes should have run method."""
-        from webbduck.modes.text2img import Text2ImgMode
-        from webbduck.modes.img2img import Img2ImgMode
-        from webbduck.modes.two_pass import TwoPassMode
-        from webbduck.modes.inpaint import InpaintMode
-        
         for cls in [Text2ImgMode, Img2ImgMode, TwoPassMode, InpaintMode]:
             mode = cls()
             assert hasattr(mode, "run")
@@ -178,12 +155,6 @@ class TestModeSignatures:
 
     def test_can_run_accepts_base_inpaint(self):
         """All can_run methods should accept base_inpaint parameter."""
-        from webbduck.modes.text2img import Text2ImgMode
-        from webbduck.modes.img2img import Img2ImgMode
-        from webbduck.modes.two_pass import TwoPassMode
-        from webbduck.modes.inpaint import InpaintMode
-        import inspect
-        
         for cls in [Text2ImgMode, Img2ImgMode, TwoPassMode, InpaintMode]:
             mode = cls()
             sig = inspect.signature(mode.can_run)
@@ -192,12 +163,6 @@ class TestModeSignatures:
 
     def test_run_accepts_base_inpaint(self):
         """All run methods should accept base_inpaint parameter."""
-        from webbduck.modes.text2img import Text2ImgMode
-        from webbduck.modes.img2img import Img2ImgMode
-        from webbduck.modes.two_pass import TwoPassMode
-        from webbduck.modes.inpaint import InpaintMode
-        import inspect
-        
         for cls in [Text2ImgMode, Img2ImgMode, TwoPassMode, InpaintMode]:
             mode = cls()
             sig = inspect.signature(mode.run)
@@ -206,11 +171,6 @@ class TestModeSignatures:
 
     def test_run_accepts_callback(self):
         """All run methods should accept optional callback parameter."""
-        from webbduck.modes.text2img import Text2ImgMode
-        from webbduck.modes.img2img import Img2ImgMode
-        from webbduck.modes.two_pass import TwoPassMode
-        from webbduck.modes.inpaint import InpaintMode
-        import inspect
 
         for cls in [Text2ImgMode, Img2ImgMode, TwoPassMode, InpaintMode]:
             mode = cls()
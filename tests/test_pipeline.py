@@ -18,6 +18,12 @@ class TestPipelineManager:
         assert hasattr(pipeline_manager, "get")
         assert callable(pipeline_manager.get)
 
+
+@pytest.mark.slow
+@pytest.mark.xdist_group("gpu")
+class TestPipelineLoading:
+    """Test pipeline loading (requires GPU)."""
+
     def test_get_returns_5_values(self, first_available_model):
         """get() should return 5 values (pipe, img2img, base_img2img, base_inpaint, trigger)."""
         from webbduck.core.pipeline import pipeline_manager
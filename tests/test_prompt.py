@@ -0,0 +1,92 @@
+"""Tests for prompt chunking against the original encoder inputs."""
+
+from pathlib import Path
+
+import pytest
+
+LONG_PROMPT = ", ".join(
+    [
+        "a portrait of an old lighthouse keeper standing on a rocky shore at dusk",
+        "weathered face",
+        "thick knitted sweater",
+        "storm clouds gathering over a dark green sea with white foam on the waves",
+        "warm lantern light",
+        "highly detailed oil painting in the style of the dutch golden age masters",
+        "dramatic rim lighting",
+        "muted palette",
+    ]
+)
+
+
+@pytest.fixture(scope="module")
+def clip_tokenizer(available_models):
+    """CLIP tokenizer bundled with a local model."""
+    from webbduck.core.pipeline import load_tokenizers
+
+    for info in available_models.values():
+        base_path = Path(info["path"])
+        if (base_path / "tokenizer").is_dir() and (base_path / "tokenizer_2").is_dir():
+            return load_tokenizers(base_path)[0]
+    pytest.skip("No model with bundled tokenizers available")
+
+
+def _baseline_chunk_prompt(tokenizer, text):
+    """chunk_prompt as it shipped before lengths were computed arithmetically."""
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    chunks = []
+    current = []
+
+    def token_len(txt):
+        return len(tokenizer(txt, truncation=True, max_length=77, add_special_tokens=True)["input_ids"])
+
+    for part in parts:
+        trial = ", ".join(current + [part])
+        if token_len(trial) <= 77:
+            current.append(part)
+        else:
+            if current:
+                chunks.append(", ".join(current))
+            current = []
+            tokens = tokenizer(part, truncation=True, max_length=77, add_special_tokens=True)
+            current.append(tokenizer.decode(tokens["input_ids"], skip_special_tokens=True))
+
+    if current:
+        chunks.append(", ".join(current))
+
+    return chunks or [""]
+
+
+def _encoder_ids(tokenizer, chunks):
+    """Input ids the standard encoders feed the text model, first 77 only."""
+    ids = []
+    for chunk in chunks:
+        ids.extend(tokenizer(chunk, padding="max_length", max_length=77, truncation=True)["input_ids"])
+    return ids[:77]
+
+
+class TestPromptChunking:
+    """Prompt chunking keeps what the model is conditioned on."""
+
+    def test_long_prompt_exceeds_clip_limit(self, clip_tokenizer):
+        """The fixture prompt must actually overflow a single CLIP window."""
+        assert len(clip_tokenizer(LONG_PROMPT)["input_ids"]) > 77
+
+    def test_leading_chunk_matches_baseline_tokens(self, clip_tokenizer):
+        """Standard conditioning encodes the same tokens as before."""
+        from webbduck.prompt.management import leading_chunk
+
+        expected = _encoder_ids(clip_tokenizer, _baseline_chunk_prompt(clip_tokenizer, LONG_PROMPT))
+        actual = _encoder_ids(clip_tokenizer, [leading_chunk(LONG_PROMPT)])
+
+        assert actual == expected
+
+    def test_chunk_prompt_keeps_prompt_order(self, clip_tokenizer):
+        """Chunking splits at commas without reordering parts."""
+        from webbduck.prompt.management import chunk_prompt
+
+        chunks = chunk_prompt(clip_tokenizer, LONG_PROMPT)
+
+        assert len(chunks) > 1
+        assert ", ".join(chunks) == LONG_PROMPT
+        for chunk in chunks:
+            assert len(clip_tokenizer(chunk)["input_ids"]) <= 77
@@ -40,6 +40,15 @@ class TestModelEndpoints:
         models = response.json()
         assert isinstance(models, list)
 
+    def test_list_models_populates_select(self, client, first_available_model):
+        """Every model entry should carry the name the UI select uses."""
+        response = client.get("/models")
+        assert response.status_code == 200
+        
+        models = response.json()
+        assert all(isinstance(m.get("name"), str) and m["name"] for m in models)
+        assert first_available_model in [m["name"] for m in models]
+
     def test_list_second_pass_models(self, client):
         """Should list second pass models."""
         response = client.get("/second_pass_models")
@@ -68,6 +77,58 @@ class TestUIEndpoint:
         assert "text/html" in response.headers["content-type"]
 
 
+class TestSocketQueue:
+    """Test per-client WebSocket queue load shedding."""
+
+    @staticmethod
+    def _full_queue(*kinds):
+        import asyncio
+        out_q = asyncio.Queue(maxsize=len(kinds))
+        for kind in kinds:
+            out_q.put_nowait((kind, kind.encode()))
+        return out_q
+
+    @staticmethod
+    def _kinds(out_q):
+        return [out_q.get_nowait()[0] for _ in range(out_q.qsize())]
+
+    def test_full_queue_evicts_queued_state_first(self):
+        """A queued state frame makes room before any other frame is lost."""
+        from webbduck.server.events import _offer
+        out_q = self._full_queue("catalog", "state", "progress")
+        _offer(out_q, "done", b"done")
+        assert self._kinds(out_q) == ["catalog", "progress", "done"]
+
+    def test_full_queue_drops_incoming_state(self):
+        """Without a queued state frame, a new state frame is dropped instead."""
+        from webbduck.server.events import _offer
+        out_q = self._full_queue("catalog", "progress")
+        _offer(out_q, "state", b"state")
+        assert self._kinds(out_q) == ["catalog", "progress"]
+
+
+@pytest.fixture
+def temp_outputs(tmp_path, monkeypatch):
+    """Point the server's output directory (WEBBDUCK_OUTPUT_DIR) at a temp dir."""
+    import importlib
+    import os
+    app_module = importlib.import_module("webbduck.server.app")
+    from webbduck.server import storage
+
+    base = tmp_path / "outputs"
+    base.mkdir()
+    # BASE is read once at import; patch every module-level copy of it.
+    monkeypatch.setenv("WEBBDUCK_OUTPUT_DIR", str(base))
+    monkeypatch.setattr(storage, "BASE", base)
+    monkeypatch.setattr(storage, "BASE_RESOLVED", base.resolve())
+    monkeypatch.setattr(storage, "_BASE_PREFIXES", (str(base.resolve()) + os.sep, str(base) + os.sep))
+    monkeypatch.setattr(app_module, "BASE", base)
+    monkeypatch.setattr(app_module, "BASE_RESOLVED", base.resolve())
+    monkeypatch.setattr(app_module, "_gallery_cache", {"sig": None, "runs": []})
+    monkeypatch.setattr(app_module, "_run_cache", {})
+    return base
+
+
 class TestGalleryEndpoint:
     """Test gallery endpoint."""
 
@@ -79,8 +140,146 @@ class TestGalleryEndpoint:
         gallery = response.json()
         assert isinstance(gallery, list)
 
+    def test_gallery_tracks_run_changes(self, client, temp_outputs):
+        """Runs are listed, rebuilt when meta.json changes, and dropped on delete."""
+        import json
+        import os
+
+        run = temp_outputs / "2026-01-02_03-04-05"
+        run.mkdir()
+        (run / "0.png").write_bytes(b"png")
+        (run / "0_upscaled.png").write_bytes(b"png")
+        meta = run / "meta.json"
+        meta.write_text(json.dumps({"prompt": "a cat", "timestamp": 1.0}))
+
+        entry, = client.get("/gallery").json()
+        assert entry["run"] == run.name
+        assert entry["images"] == [f"outputs/{run.name}/0.png"]
+        assert entry["variants"] == {"0.png": f"outputs/{run.name}/0_upscaled.png"}
+        assert entry["meta"]["prompt"] == "a cat"
+
+        meta.write_text(json.dumps({"prompt": "a dog", "timestamp": 1.0}))
+        # Guarantee a new mtime even on coarse-grained filesystems
+        stat = meta.stat()
+        os.utime(meta, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        entry, = client.get("/gallery").json()
+        assert entry["meta"]["prompt"] == "a dog"
+
+        response = client.post("/delete_run", data={"path": entry["images"][0]})
+        assert response.json() == {"status": "ok"}
+        assert not run.exists()
+        assert client.get("/gallery").json() == []
+
+
+class TestInputStorage:
+    """Test content-addressed upload storage."""
+
+    def test_store_input_is_complete_and_deduped(self, tmp_path, monkeypatch):
+        """Identical uploads share one file and leave no partial writes behind."""
+        import importlib
+        app_module = importlib.import_module("webbduck.server.app")
+        monkeypatch.setattr(app_module, "INPUTS_DIR", tmp_path)
+
+        first = app_module._store_input(b"image-bytes", ".png")
+        second = app_module._store_input(b"image-bytes", ".png")
+
+        assert first == second
+        assert first.read_bytes() == b"image-bytes"
+        assert [p.name for p in tmp_path.iterdir()] == [first.name]
+
+
+class TestQueueEndpoints:
+    """Test queue listing and cancellation."""
+
+    def test_queue_returns_payload(self, client):
+        """Queue should list active jobs and recent completions."""
+        response = client.get("/queue")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert isinstance(data["jobs"], list)
+        assert isinstance(data["recent_completed"], list)
+        assert "queued_count" in data
+
+    def test_cancel_unknown_job(self, client):
+        """Cancelling an unknown job should return 404."""
+        response = client.post("/queue/cancel", data={"job_id": "missing"})
+        assert response.status_code == 404
+
+    def test_cancel_queued_job_tombstones_it(self, monkeypatch):
+        """Cancelling a queued job settles its future and shifts later jobs up."""
+        import asyncio
+        import importlib
+        import httpx
+        app_module = importlib.import_module("webbduck.server.app")
+        from webbduck.core import worker
+
+        # Fresh queue state; no GPU worker runs to drain it.
+        monkeypatch.setattr(app_module, "generation_queue", asyncio.Queue(maxsize=32))
+        monkeypatch.setattr(app_module, "queued_jobs", {})
+
+        async def scenario():
+            # One loop for every request, so queued futures stay usable.
+            transport = httpx.ASGITransport(app=app_module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                form = {"base_model": "any", "wait_for_result": "false"}
+                first = (await ac.post("/test", data=form)).json()
+                second = (await ac.post("/test", data=form)).json()
+                assert (first["queue_position"], second["queue_position"]) == (1, 2)
+                first_job = app_module.queued_jobs[first["job_id"]]
+
+                response = await ac.post("/queue/cancel", data={"job_id": first["job_id"]})
+                assert response.json() == {"status": "cancelled", "job_id": first["job_id"]}
+                assert first_job["future"].cancelled()
+
+                jobs = {job["job_id"]: job for job in (await ac.get("/queue")).json()["jobs"]}
+                assert jobs[second["job_id"]]["queue_position"] == 1
+                assert first["job_id"] not in jobs
+
+            # The tombstone is still queued; the worker must skip it untouched.
+            tombstone = app_module.generation_queue.get_nowait()
+            assert tombstone is first_job
+            tombstone["on_start"] = lambda job: pytest.fail("tombstone was started")
+
+            queue = asyncio.Queue()
+            queue.put_nowait(tombstone)
+            task = asyncio.create_task(worker.gpu_worker(queue))
+            await asyncio.wait_for(queue.join(), timeout=5)
+            task.cancel()
+
+        asyncio.run(scenario())
+
+
+class TestGenerationValidation:
+    """Test generation form validation (no GPU needed)."""
+
+    def test_missing_field_error_omits_form(self, client, test_image_bytes):
+        """422s report the missing field like Form() params, without the upload."""
+        response = client.post(
+            "/generate",
+            data={"prompt": "test"},
+            files={"image": ("test.jpg", test_image_bytes, "image/jpeg")},
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"] == [{
+            "type": "missing",
+            "loc": ["body", "base_model"],
+            "msg": "Field required",
+            "input": None,
+        }]
+
+    def test_form_fields_documented(self, client):
+        """/test and /generate describe their form fields in OpenAPI."""
+        paths = client.get("/openapi.json").json()["paths"]
+        for path in ("/test", "/generate"):
+            content = paths[path]["post"]["requestBody"]["content"]
+            schema = next(iter(content.values()))["schema"]["allOf"][0]
+            assert "base_model" in schema["properties"]
+
 
 @pytest.mark.slow
+@pytest.mark.xdist_group("gpu")
 class TestGenerationEndpoints:
     """Test generation endpoints (requires GPU)."""
 
@@ -92,9 +291,9 @@ class TestGenerationEndpoints:
         # Should fail without base_model
         assert response.status_code == 422
 
-    def test_generate_basic(self, client, first_available_model):
+    def test_generate_basic(self, live_client, first_available_model):
         """Test basic generation endpoint."""
-        response = client.post("/generate", data={
+        response = live_client.post("/generate", data={
             "prompt": "a cat",
             "base_model": first_available_model,
             "steps": 5,  # Minimal steps for faster test
@@ -110,9 +309,9 @@ class TestGenerationEndpoints:
             assert "images" in data
             assert "seed" in data
 
-    def test_test_endpoint(self, client, first_available_model):
+    def test_test_endpoint(self, live_client, first_available_model):
         """Test the /test endpoint for single image generation."""
-        response = client.post("/test", data={
+        response = live_client.post("/test", data={
             "prompt": "a dog",
             "base_model": first_available_model,
             "steps": 5,
@@ -1,6 +1,7 @@
 """Tests for captioning server endpoints."""
 
 import pytest
+from io import BytesIO
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
@@ -36,16 +37,16 @@ class TestCaptioningEndpoints:
         assert "detailed" in styles
         assert "short" in styles
 
-    def test_caption_image_no_plugins(self, client, test_image_path):
+    def test_caption_image_no_plugins(self, client, test_image_bytes):
         """Test /caption endpoint returns 503 when no plugins."""
         with patch("webbduck.server.app.is_captioning_available", return_value=False):
-            files = {"image": open(test_image_path, "rb")}
+            files = {"image": ("test.jpg", BytesIO(test_image_bytes), "image/jpeg")}
             response = client.post("/caption", files=files)
             
             assert response.status_code == 503
             assert "error" in response.json()
 
-    def test_caption_image_success(self, client, test_image_path):
+    def test_caption_image_success(self, client, test_image_bytes):
         """Test successful caption generation."""
         # Mock dependencies in server/app.py
         with patch("webbduck.server.app.is_captioning_available", return_value=True), \
@@ -54,7 +55,7 @@ class TestCaptioningEndpoints:
              patch("webbduck.server.app.broadcast_state"), \
              patch("webbduck.core.pipeline.pipeline_manager.pipe", None):  # Mock pipeline manager
                 
-            files = {"image": open(test_image_path, "rb")}
+            files = {"image": ("test.jpg", BytesIO(test_image_bytes), "image/jpeg")}
             data = {"style": "short", "max_tokens": 100}
             
             response = client.post("/caption", files=files, data=data)
@@ -64,7 +65,7 @@ class TestCaptioningEndpoints:
             assert result["caption"] == "A photo of a cat"
             assert result["style"] == "short"
 
-    def test_caption_image_handles_pipeline_offload_safe(self, client, test_image_path):
+    def test_caption_image_handles_pipeline_offload_safe(self, client, test_image_bytes):
         """Test captioning offload logic safely handles missing pipeline."""
         with patch("webbduck.server.app.is_captioning_available", return_value=True), \
              patch("webbduck.server.app.generate_caption", return_value="Caption"), \
@@ -75,7 +76,7 @@ class TestCaptioningEndpoints:
              with patch("webbduck.core.pipeline.pipeline_manager") as mock_pm:
                 mock_pm.pipe = None  # Ensure no pipe to offload
                 
-                files = {"image": open(test_image_path, "rb")}
+                files = {"image": ("test.jpg", BytesIO(test_image_bytes), "image/jpeg")}
                 response = client.post("/caption", files=files)
                 
                 assert response.status_code == 200
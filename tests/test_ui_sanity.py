@@ -1,46 +1,112 @@
+import json
+import os
+from pathlib import Path
+
 import pytest
 from playwright.sync_api import Page, expect
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Wall-clock budget for the measured steps of the shared-page tests
+UI_PERF_BUDGET_S = float(os.environ.get("WEBBDUCK_UI_PERF_BUDGET_S", "15"))
+# Steps the budget covers: shared page load plus the selects and gallery tests
+UI_PERF_STEPS = ("goto", "selects", "gallery")
+
+SEL_MODEL = "#base_model"
+SEL_SCHEDULER = "#scheduler"
+SEL_GALLERY_TAB = ".nav-tab[data-view='gallery']"
+SEL_GALLERY_VIEW = "#view-gallery"
+SEL_GALLERY_STATE = "#gallery-sessions:visible, #gallery-empty:visible"
+SEL_GENERATE = "#btn-generate"
+
+# True once every select in the argument list has a value
+SELECTS_POPULATED_JS = """(selectors) => selectors.every((sel) => {
+    const el = document.querySelector(sel);
+    return el && el.value !== "";
+})"""
+
+
 @pytest.mark.browser
-def test_ui_loads_components(page: Page):
+def test_ui_renders(shared_page: Page, ui_perf):
     """
-    Verify that key UI components load correctly.
-    This assumes the server is already running at localhost:8000.
+    Verify that the page shell, gallery view and controls render.
+    Endpoint contracts (/models, /schedulers) are covered without a
+    browser in test_server.py.
     """
-    page.on("console", lambda msg: print(f"BROWSER CONSOLE: {msg.text}"))
-    page.on("pageerror", lambda exc: print(f"BROWSER ERROR: {exc}"))
-    page.on("response", lambda response: print(f"NETWORK: {response.status} {response.url}"))
-    page.goto("http://127.0.0.1:8000")
+    page = shared_page
     
     # 1. Verify Title
-    expect(page).to_have_title("WebbDuck - AI Image Studio")
-    
-    # 2. Verify Models Load
-    model_select = page.locator("#base_model")
-    # Wait for options to populate (should vary from "Loading...")
-    expect(model_select).not_to_have_value("", timeout=15000) 
-    # Check that we have options other than the placeholder
-    options = model_select.locator("option")
-    assert options.count() > 1
+    assert page.title() == "WebbDuck - AI Image Studio"
     
-    # 3. Verify Schedulers Load
-    scheduler_select = page.locator("#scheduler")
-    expect(scheduler_select).not_to_have_value("", timeout=15000)
+    # 2. Verify Gallery Loads (Empty state or Sessions)
+    # Switch to Gallery tab to ensure visibility. A DOM click skips the
+    # actionability checks; this is a tab switch, not an interaction test.
+    with ui_perf.measure("gallery"):
+        page.eval_on_selector(SEL_GALLERY_TAB, "el => el.click()")
+        expect(page.locator(SEL_GALLERY_VIEW)).to_have_class("view active")
+        
+        # Once rendered, exactly one of gallery-sessions / gallery-empty is
+        # shown; a single selector list checks both in one query per poll.
+        expect(page.locator(SEL_GALLERY_STATE)).to_have_count(1)
     
-    # 4. Verify Gallery Loads (Empty state or Sessions)
-    # Either gallery-sessions has children OR gallery-empty is visible
-    gallery_sessions = page.locator("#gallery-sessions")
-    gallery_empty = page.locator("#gallery-empty")
-    
-    # Switch to Gallery tab to ensure visibility
-    page.click(".nav-tab[data-view='gallery']")
-    expect(page.locator("#view-gallery")).to_have_class("view active")
-    
-    # Ensure gallery containers are present in the active view
-    expect(gallery_sessions).to_be_attached()
-    expect(gallery_empty).to_be_attached()
-    
-    # 5. Verify Buttons are clickable (not disabled by default unless intended)
-    btn_generate = page.locator("#btn-generate")
-    expect(btn_generate).to_be_enabled()
+    # 3. Verify Buttons are clickable (not disabled by default unless intended)
+    expect(page.locator(SEL_GENERATE)).to_be_enabled()
+
+
+@pytest.mark.browser
+def test_ui_populates_selects(shared_page: Page, catalog_responses, ui_perf):
+    """Verify the model and scheduler selects render the catalog responses."""
+    page = shared_page
 
+    # The page's own catalog fetches are the readiness signal
+    for name, response in catalog_responses.items():
+        assert response.status == 200, f"/{name} returned {response.status}"
+        assert response.json(), f"/{name} returned an empty list"
+
+    # The data is in; this only covers the render after the fetch resolves
+    # (should vary from "Loading...").
+    with ui_perf.measure("selects"):
+        page.wait_for_function(SELECTS_POPULATED_JS, arg=[SEL_MODEL, SEL_SCHEDULER], timeout=5000)
+    models = json.loads((FIXTURES_DIR / "models.json").read_text())
+    option_values = page.eval_on_selector(
+        SEL_MODEL, "el => Array.from(el.options, (o) => o.value)"
+    )
+    assert option_values == [m["name"] for m in models]
+
+
+@pytest.mark.browser
+@pytest.mark.integration
+def test_ui_populates_selects_live(cached_page: Page, ui_base_url):
+    """Same check against the real backend catalog (slow: scans registries)."""
+    page = cached_page
+    with page.expect_response(lambda r: r.url.endswith("/models"), timeout=15000) as models, \
+         page.expect_response(lambda r: r.url.endswith("/schedulers"), timeout=15000) as schedulers:
+        page.goto(ui_base_url, wait_until="commit")
+
+    for response in (models.value, schedulers.value):
+        assert response.status == 200, f"{response.url} returned {response.status}"
+
+    # A non-empty value means a real (non-placeholder) option is selected,
+    # so no separate option-count check is needed.
+    page.wait_for_function(SELECTS_POPULATED_JS, arg=[SEL_MODEL, SEL_SCHEDULER], timeout=5000)
+
+
+@pytest.mark.browser
+def test_ui_perf_budget(shared_page: Page, ui_perf):
+    """Fail when the measured shared-page steps exceed UI_PERF_BUDGET_S.
+
+    Skipped unless every step in UI_PERF_STEPS was measured in this session.
+
+    Step timings and the browser's navigation entry are written to
+    tests/test-artifacts/ui_perf.json for trend tracking.
+    """
+    ui_perf.navigation = shared_page.evaluate(
+        "() => performance.getEntriesByType('navigation').map((e) => e.toJSON())"
+    )
+    # Deselected, or run on another xdist worker, the budget would pass vacuously
+    missing = [step for step in UI_PERF_STEPS if step not in ui_perf.metrics]
+    if missing:
+        pytest.skip(f"UI perf steps not measured in this session: {missing}")
+    assert ui_perf.total < UI_PERF_BUDGET_S, (
+        f"UI steps took {ui_perf.total:.2f}s (budget {UI_PERF_BUDGET_S}s): {ui_perf.metrics}"
+    )
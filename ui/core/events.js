@@ -140,6 +140,8 @@ export const Events = {
 // WEBSOCKET HANDLING
 // ═══════════════════════════════════════════════════════════════
 
+const frameDecoder = new TextDecoder();
+
 /**
  * Initialize WebSocket connection for real-time updates
  */
@@ -155,6 +157,8 @@ export function initWebSocket() {
 
     function connect() {
         ws = new WebSocket(wsUrl);
+        // Server frames are binary UTF-8 JSON.
+        ws.binaryType = 'arraybuffer';
 
         ws.onopen = () => {
             console.log('🔌 WebSocket Connected');
@@ -162,11 +166,17 @@ export function initWebSocket() {
 
         ws.onmessage = (event) => {
             try {
-                const data = JSON.parse(event.data);
+                const raw = typeof event.data === 'string'
+                    ? event.data
+                    : frameDecoder.decode(event.data);
+                const data = JSON.parse(raw);
                 if (data?.type === 'state') {
                     emit(Events.STATUS_UPDATE, data);
                 } else if (data?.type === 'queue') {
                     emit(Events.QUEUE_UPDATE, data.payload || {});
+                    if (data.state) {
+                        emit(Events.STATUS_UPDATE, { type: 'state', ...data.state });
+                    }
                 } else if (data?.type === 'catalog') {
                     emit(Events.CATALOG_UPDATE, data.payload || {});
                 }
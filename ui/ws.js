@@ -1,7 +1,11 @@
 const ws = new WebSocket(`ws://${location.host}/ws`);
+ws.binaryType = "arraybuffer";
+const decoder = new TextDecoder();
 
 ws.onmessage = (e) => {
-  const msg = JSON.parse(e.data);
+  const msg = JSON.parse(
+    typeof e.data === "string" ? e.data : decoder.decode(e.data)
+  );
 
   if (msg.type !== "state") return;
 